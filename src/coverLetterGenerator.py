@@ -11,53 +11,235 @@ coverLetterGenerator.py
 
 import os
 import json
+import functools
+import itertools
 import torch
 import pdfplumber
 import pandas as pd
 import re
+import tempfile
+import threading
 from datetime import datetime
-from transformers import AutoTokenizer, AutoModelForCausalLM
+from transformers import AutoTokenizer, AutoModelForCausalLM, StoppingCriteria, StoppingCriteriaList
+
+# vLLM为可选依赖：安装后优先使用（PagedAttention + 连续批处理），否则回退到transformers
+try:
+    from vllm import LLM, SamplingParams
+except ImportError:
+    LLM = None
+    SamplingParams = None
+
+# llama.cpp为可选依赖：存在Q4_K_M量化的GGUF模型时用于CPU推理
+try:
+    from llama_cpp import Llama
+except ImportError:
+    Llama = None
+
+# PyMuPDF为可选依赖：纯文本提取比pdfplumber快得多，未安装时回退到pdfplumber
+try:
+    import fitz
+except ImportError:
+    fitz = None
 
 # ---------- 常量 ----------
 MODEL_DIR = r"Qwen2.5-1.5B-Instruct"
+GGUF_MODEL_PATH = r"Qwen2.5-1.5B-Instruct-GGUF/qwen2.5-1.5b-instruct-q4_k_m.gguf"
 CONFIG_PATH = r"input/cover_letter_config.json"
 CV_DIR = r"CV"
 EXCEL_PATH = r"input/companyInfo.xlsx"
 COVER_LETTER_CACHE_DIR = r"cover_letters_cache"
+RESUME_MAX_CHARS = 2000       # 写入prompt的简历最大字符数
+CPU_MAX_THREADS = 16          # CPU推理时使用的最大线程数
+
+# ---------- 模型缓存 ----------
+_MODEL_CACHE = {"model": None, "tok": None}
+_MODEL_LOCK = threading.Lock()
+# 模型全进程共用一份，vLLM引擎、llama.cpp模型都不是线程安全的，每次生成都需持有此锁
+_GEN_LOCK = threading.Lock()
+
+# ---------- 公司信息缓存 ----------
+_COMPANY_CACHE = {"mtime": None, "index": None}
+
+# ---------- 预编译正则 ----------
+_RE_SAFENAME = re.compile(r'[^\w\s-]')
+_RE_SUBJECT_ANY = re.compile(r'^(?:[Ss]ubject|主题|邮件主题)\s*:')
+_RE_QUOTES = re.compile(r'^["\']|["\']$')
+_RE_SUBJECT_PREFIX = re.compile(r'^[Ss]ubject\s*:\s*')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_SUBJECT_INVALID = re.compile(r'[^\w\s\-\(\)（）\u4e00-\u9fff]')
+
+# ---------- Cover letter缓存（内存镜像） ----------
+# applicant_name -> (缓存文件mtime, 缓存数据)；缓存数据写入后不再修改，更新时整体替换
+_CACHE_MEM = {}
+_CACHE_LOCK = threading.Lock()
+_CACHE_DIR_READY = False
+
+def _tune_cpu_model(model):
+    """模型落在CPU上时调整线程数，并在支持AVX-512的CPU上改用BF16推理"""
+    if not any(p.device.type == "cpu" for p in model.parameters()):
+        return model
+    torch.set_num_threads(min(CPU_MAX_THREADS, os.cpu_count() or 1))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # interop线程数只能在并行任务开始前设置一次
+        pass
+    torch.backends.mkldnn.enabled = True
+    # 没有AVX-512(BF16/AMX)的CPU上BF16矩阵运算反而更慢，保持FP32
+    if "AVX512" in torch.backends.cpu.get_cpu_capability():
+        model = model.to(torch.bfloat16)
+        print("✓ CPU推理使用BF16")
+    return model
+
+def _compile_cuda_model(model, tok):
+    """GPU上用torch.compile融合算子，并在加载时预热，避免首次生成承担编译开销
+    
+    generate()默认使用动态KV缓存，每步输入形状都在变化，因此不用依赖CUDA Graph的
+    reduce-overhead模式（会反复重新编译，且不能在录制线程以外的线程中重放），
+    而是用default模式并按动态形状编译。生成时编译相关的错误由_generate回退到eager。
+    """
+    if not torch.cuda.is_available() or not hasattr(torch, "compile"):
+        return model
+    eager_forward = model.forward
+    try:
+        model.forward = torch.compile(eager_forward, mode="default", dynamic=True, fullgraph=False)
+        model._eager_forward = eager_forward
+        warmup_ids = tok("hi", return_tensors="pt").input_ids.to(model.device)
+        with torch.no_grad():
+            model.generate(input_ids=warmup_ids, max_new_tokens=4)
+        print("✓ 已启用torch.compile")
+    except Exception as e:
+        print(f"⚠️  torch.compile失败，使用默认模式: {e}")
+        model.forward = eager_forward
+        model.__dict__.pop("_eager_forward", None)
+    return model
+
+def _generate(model, **kwargs):
+    """调用transformers的generate（持有_GEN_LOCK）；编译后的forward出错时恢复eager forward并重试一次"""
+    with _GEN_LOCK, torch.no_grad():
+        try:
+            return model.generate(**kwargs)
+        except Exception as e:
+            eager_forward = model.__dict__.pop("_eager_forward", None)
+            if eager_forward is None:
+                raise
+            print(f"⚠️  torch.compile模型生成失败，改用默认模式: {e}")
+            model.forward = eager_forward
+            return model.generate(**kwargs)
+
+def _get_model():
+    """获取Qwen模型和tokenizer（首次调用时加载，之后复用）"""
+    if _MODEL_CACHE["model"] is None:
+        with _MODEL_LOCK:
+            if _MODEL_CACHE["model"] is None:
+                print("▶ 加载Qwen模型...")
+                tok = AutoTokenizer.from_pretrained(
+                    MODEL_DIR, trust_remote_code=True, local_files_only=True)
+                # 共享的tokenizer只在加载时配置：批量生成用左侧填充（decoder-only模型
+                # 需要生成内容紧接在prompt之后），生成时不再修改
+                if tok.pad_token_id is None:
+                    tok.pad_token_id = tok.eos_token_id
+                tok.padding_side = "left"
+                model = None
+                if LLM is not None:
+                    try:
+                        model = LLM(model=MODEL_DIR, dtype="auto",
+                                    trust_remote_code=True,
+                                    gpu_memory_utilization=0.9,
+                                    # 同一份简历的system+resume前缀在多次生成间复用KV缓存
+                                    enable_prefix_caching=True)
+                        print("✓ 使用vLLM推理后端")
+                    except Exception as e:
+                        print(f"⚠️  vLLM初始化失败，回退到transformers: {e}")
+                if model is None and Llama is not None and os.path.exists(GGUF_MODEL_PATH):
+                    try:
+                        model = Llama(model_path=GGUF_MODEL_PATH, n_ctx=4096,
+                                      n_threads=os.cpu_count(), n_batch=2048,
+                                      verbose=False)
+                        print("✓ 使用llama.cpp量化模型 (Q4_K_M)")
+                    except Exception as e:
+                        print(f"⚠️  llama.cpp初始化失败，回退到transformers: {e}")
+                if model is None:
+                    model = AutoModelForCausalLM.from_pretrained(
+                        MODEL_DIR, trust_remote_code=True, local_files_only=True,
+                        device_map="auto", torch_dtype="auto").eval()
+                    model = _tune_cpu_model(model)
+                    model = _compile_cuda_model(model, tok)
+                _MODEL_CACHE["tok"] = tok
+                _MODEL_CACHE["model"] = model
+    return _MODEL_CACHE["model"], _MODEL_CACHE["tok"]
 
 def ensure_cache_directory():
-    """确保缓存目录存在"""
-    if not os.path.exists(COVER_LETTER_CACHE_DIR):
-        os.makedirs(COVER_LETTER_CACHE_DIR)
+    """确保缓存目录存在（进程内只检查一次）"""
+    global _CACHE_DIR_READY
+    if _CACHE_DIR_READY:
+        return
+    if not os.path.isdir(COVER_LETTER_CACHE_DIR):
+        os.makedirs(COVER_LETTER_CACHE_DIR, exist_ok=True)
         print(f"✓ 创建缓存目录: {COVER_LETTER_CACHE_DIR}")
+    _CACHE_DIR_READY = True
 
 def get_cache_file_path(applicant_name: str) -> str:
     """获取缓存文件路径"""
     ensure_cache_directory()
-    safe_name = re.sub(r'[^\w\s-]', '_', applicant_name)
+    safe_name = _RE_SAFENAME.sub('_', applicant_name)
     return os.path.join(COVER_LETTER_CACHE_DIR, f"{safe_name}_cover_letters.json")
 
+def _get_file_mtime(path: str):
+    """获取文件修改时间，文件不存在时返回None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
 def load_cached_cover_letters(applicant_name: str) -> dict:
-    """加载缓存的cover letters"""
+    """加载缓存的cover letters（内存中保留一份，文件被外部修改时重新读取）
+    
+    返回的字典由多个线程共用，调用方只读不改；修改请用save/delete函数。
+    """
+    with _CACHE_LOCK:
+        return _load_cached_locked(applicant_name)
+
+def _load_cached_locked(applicant_name: str) -> dict:
+    """load_cached_cover_letters的实现（调用方需持有_CACHE_LOCK）"""
     cache_file = get_cache_file_path(applicant_name)
-    if os.path.exists(cache_file):
+    mtime = _get_file_mtime(cache_file)
+    cached = _CACHE_MEM.get(applicant_name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    data = {}
+    if mtime is not None:
         try:
             with open(cache_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             print(f"✓ 加载缓存文件: {cache_file}")
-            return data
         except Exception as e:
             print(f"⚠️  加载缓存文件失败: {e}")
-    return {}
+            data = {}
+    _CACHE_MEM[applicant_name] = (mtime, data)
+    return data
+
+def _write_cache_file(applicant_name: str, cache_data: dict):
+    """将缓存写回磁盘（先写临时文件再替换，避免写入中断损坏缓存），成功后才更新内存镜像
+    
+    调用方需持有_CACHE_LOCK，且cache_data为新建的字典。
+    """
+    cache_file = get_cache_file_path(applicant_name)
+    fd, tmp_path = tempfile.mkstemp(dir=COVER_LETTER_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache_data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, cache_file)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _CACHE_MEM[applicant_name] = (_get_file_mtime(cache_file), cache_data)
 
 def save_cover_letter_to_cache(applicant_name: str, company_name: str, cover_letter: str, 
                               subject: str, mode: str, cv_filename: str):
     """保存cover letter到缓存"""
-    cache_file = get_cache_file_path(applicant_name)
-    
-    # 加载现有缓存
-    cache_data = load_cached_cover_letters(applicant_name)
-    
     # 创建新的cover letter记录
     cover_letter_record = {
         "company_name": company_name,
@@ -69,25 +251,24 @@ def save_cover_letter_to_cache(applicant_name: str, company_name: str, cover_let
         "language": detect_company_language(company_name)
     }
     
-    # 更新缓存
-    cache_data[company_name] = cover_letter_record
-    
-    # 保存到文件
+    # 在现有缓存的副本上更新并保存到文件，写入成功后才替换内存镜像
     try:
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        with _CACHE_LOCK:
+            cache_data = dict(_load_cached_locked(applicant_name))
+            cache_data[company_name] = cover_letter_record
+            _write_cache_file(applicant_name, cache_data)
         print(f"✓ 保存cover letter到缓存: {company_name}")
     except Exception as e:
         print(f"❌ 保存缓存失败: {e}")
 
-def get_cached_cover_letter(applicant_name: str, company_name: str) -> tuple:
+def get_cached_cover_letter(applicant_name: str, company_name: str, _cache: dict = None) -> tuple:
     """
     获取缓存的cover letter
     
     Returns:
         tuple: (cover_letter, subject, mode, cv_filename) 或 (None, None, None, None)
     """
-    cache_data = load_cached_cover_letters(applicant_name)
+    cache_data = load_cached_cover_letters(applicant_name) if _cache is None else _cache
     
     if company_name in cache_data:
         record = cache_data[company_name]
@@ -114,11 +295,35 @@ def detect_company_language(company_name: str) -> str:
         str: 'chinese' 或 'english'
     """
     # 检查是否包含中文字符
-    if re.search(r'[\u4e00-\u9fff]', company_name):
+    if any('\u4e00' <= c <= '\u9fff' for c in company_name):
         return 'chinese'
     else:
         return 'english'
 
+# ---------- 语言/模式对应的prompt配置 ----------
+_PROMPTS = {
+    ("chinese", "professional"): {
+        "system_prompt": "你是一位专业的求职顾问，擅长撰写高质量的cover letter。你需要根据候选人的简历和公司信息，生成个性化的求职信。请参考LSE CV指南的最佳实践，确保信件专业、有针对性且突出候选人的优势。生成的内容应该是简洁的邮件正文，不要包含地址、日期等格式信息。",
+        "user_prompt_template": "候选人简历内容：\n{resume_content}\n\n目标公司：{company_name}\n公司简介：{company_description}\n公司要求：{company_requirements}\n\n请为{applicant_name}生成一封专业的cover letter邮件正文。要求：\n1. 开头要个性化，提到公司名称\n2. 突出候选人与公司要求的匹配点\n3. 语言专业、简洁、有说服力\n4. 结尾要表达对机会的期待\n5. 控制在200-300字左右\n6. 不要包含地址、日期等格式信息，直接输出邮件正文内容\n7. 使用中文撰写\n\n请直接输出cover letter内容，不要包含任何说明文字。",
+        "subject_prompt_template": "候选人简历内容：\n{resume_content}\n\n目标公司：{company_name}\n公司简介：{company_description}\n公司要求：{company_requirements}\n\n请为{applicant_name}生成一个专业的邮件主题行。要求：\n1. 简洁明了，不超过50个字符\n2. 包含公司名称\n3. 体现求职意向\n4. 专业正式\n5. 不要包含特殊字符\n6. 使用中文\n\n请直接输出主题行，不要包含任何说明文字。"
+    },
+    ("chinese", "enthusiastic"): {
+        "system_prompt": "你是一位充满激情的求职顾问，擅长撰写富有感染力的cover letter。你需要根据候选人的简历和公司信息，生成个性化的求职信。请参考LSE CV指南，同时让语言更加积极、热情，展现候选人的学习热情和成长潜力。生成的内容应该是简洁的邮件正文，不要包含地址、日期等格式信息。",
+        "user_prompt_template": "候选人简历内容：\n{resume_content}\n\n目标公司：{company_name}\n公司简介：{company_description}\n公司要求：{company_requirements}\n\n请为{applicant_name}生成一封热情积极的cover letter邮件正文。要求：\n1. 展现对公司的热情和兴趣\n2. 突出候选人的学习能力和成长潜力\n3. 语言积极、有感染力\n4. 表达对实习机会的强烈期待\n5. 控制在200-300字左右\n6. 不要包含地址、日期等格式信息，直接输出邮件正文内容\n7. 使用中文撰写\n\n请直接输出cover letter内容，不要包含任何说明文字。",
+        "subject_prompt_template": "候选人简历内容：\n{resume_content}\n\n目标公司：{company_name}\n公司简介：{company_description}\n公司要求：{company_requirements}\n\n请为{applicant_name}生成一个热情积极的邮件主题行。要求：\n1. 简洁明了，不超过50个字符\n2. 包含公司名称\n3. 体现热情和期待\n4. 积极正面\n5. 不要包含特殊字符\n6. 使用中文\n\n请直接输出主题行，不要包含任何说明文字。"
+    },
+    ("english", "professional"): {
+        "system_prompt": "You are a professional career advisor, skilled in writing high-quality cover letters. You need to generate personalized cover letters based on the candidate's resume and company information. Please refer to LSE CV guidelines best practices to ensure the letter is professional, targeted, and highlights the candidate's strengths. The generated content should be concise email body text, without address, date, or other formatting information.",
+        "user_prompt_template": "Candidate Resume Content:\n{resume_content}\n\nTarget Company: {company_name}\nCompany Description: {company_description}\nCompany Requirements: {company_requirements}\n\nPlease generate a professional cover letter email body for {applicant_name}. Requirements:\n1. Start with personalization, mentioning the company name\n2. Highlight the match between candidate and company requirements\n3. Professional, concise, and persuasive language\n4. End with expression of interest in the opportunity\n5. Keep within 200-300 words\n6. Do not include address, date, or other formatting information\n7. Write in English\n\nPlease output the cover letter content directly, without any explanatory text.",
+        "subject_prompt_template": "Candidate Resume Content:\n{resume_content}\n\nTarget Company: {company_name}\nCompany Description: {company_description}\nCompany Requirements: {company_requirements}\n\nPlease generate a professional email subject line for {applicant_name}. Requirements:\n1. Concise and clear, no more than 50 characters\n2. Include company name\n3. Reflect job application intent\n4. Professional and formal\n5. No special characters\n6. Write in English\n\nPlease output the subject line directly, without any explanatory text."
+    },
+    ("english", "enthusiastic"): {
+        "system_prompt": "You are an enthusiastic career advisor, skilled in writing compelling cover letters. You need to generate personalized cover letters based on the candidate's resume and company information. Please refer to LSE CV guidelines while making the language more positive and enthusiastic, showcasing the candidate's learning enthusiasm and growth potential. The generated content should be concise email body text, without address, date, or other formatting information.",
+        "user_prompt_template": "Candidate Resume Content:\n{resume_content}\n\nTarget Company: {company_name}\nCompany Description: {company_description}\nCompany Requirements: {company_requirements}\n\nPlease generate an enthusiastic and positive cover letter email body for {applicant_name}. Requirements:\n1. Show enthusiasm and interest in the company\n2. Highlight the candidate's learning ability and growth potential\n3. Positive and engaging language\n4. Express strong anticipation for the internship opportunity\n5. Keep within 200-300 words\n6. Do not include address, date, or other formatting information\n7. Write in English\n\nPlease output the cover letter content directly, without any explanatory text.",
+        "subject_prompt_template": "Candidate Resume Content:\n{resume_content}\n\nTarget Company: {company_name}\nCompany Description: {company_description}\nCompany Requirements: {company_requirements}\n\nPlease generate an enthusiastic and positive email subject line for {applicant_name}. Requirements:\n1. Concise and clear, no more than 50 characters\n2. Include company name\n3. Reflect enthusiasm and anticipation\n4. Positive and upbeat\n5. No special characters\n6. Write in English\n\nPlease output the subject line directly, without any explanatory text."
+    },
+}
+
 def get_language_specific_prompt(company_name: str, mode: str) -> dict:
     """
     根据公司语言和模式获取相应的prompt配置
@@ -131,33 +336,19 @@ def get_language_specific_prompt(company_name: str, mode: str) -> dict:
         dict: 包含system_prompt, user_prompt_template, subject_prompt_template的配置
     """
     language = detect_company_language(company_name)
-    
-    if language == 'chinese':
-        if mode == 'professional':
-            return {
-                "system_prompt": "你是一位专业的求职顾问，擅长撰写高质量的cover letter。你需要根据候选人的简历和公司信息，生成个性化的求职信。请参考LSE CV指南的最佳实践，确保信件专业、有针对性且突出候选人的优势。生成的内容应该是简洁的邮件正文，不要包含地址、日期等格式信息。",
-                "user_prompt_template": "候选人简历内容：\n{resume_content}\n\n目标公司：{company_name}\n公司简介：{company_description}\n公司要求：{company_requirements}\n\n请为{applicant_name}生成一封专业的cover letter邮件正文。要求：\n1. 开头要个性化，提到公司名称\n2. 突出候选人与公司要求的匹配点\n3. 语言专业、简洁、有说服力\n4. 结尾要表达对机会的期待\n5. 控制在200-300字左右\n6. 不要包含地址、日期等格式信息，直接输出邮件正文内容\n7. 使用中文撰写\n\n请直接输出cover letter内容，不要包含任何说明文字。",
-                "subject_prompt_template": "候选人简历内容：\n{resume_content}\n\n目标公司：{company_name}\n公司简介：{company_description}\n公司要求：{company_requirements}\n\n请为{applicant_name}生成一个专业的邮件主题行。要求：\n1. 简洁明了，不超过50个字符\n2. 包含公司名称\n3. 体现求职意向\n4. 专业正式\n5. 不要包含特殊字符\n6. 使用中文\n\n请直接输出主题行，不要包含任何说明文字。"
-            }
-        else:  # enthusiastic
-            return {
-                "system_prompt": "你是一位充满激情的求职顾问，擅长撰写富有感染力的cover letter。你需要根据候选人的简历和公司信息，生成个性化的求职信。请参考LSE CV指南，同时让语言更加积极、热情，展现候选人的学习热情和成长潜力。生成的内容应该是简洁的邮件正文，不要包含地址、日期等格式信息。",
-                "user_prompt_template": "候选人简历内容：\n{resume_content}\n\n目标公司：{company_name}\n公司简介：{company_description}\n公司要求：{company_requirements}\n\n请为{applicant_name}生成一封热情积极的cover letter邮件正文。要求：\n1. 展现对公司的热情和兴趣\n2. 突出候选人的学习能力和成长潜力\n3. 语言积极、有感染力\n4. 表达对实习机会的强烈期待\n5. 控制在200-300字左右\n6. 不要包含地址、日期等格式信息，直接输出邮件正文内容\n7. 使用中文撰写\n\n请直接输出cover letter内容，不要包含任何说明文字。",
-                "subject_prompt_template": "候选人简历内容：\n{resume_content}\n\n目标公司：{company_name}\n公司简介：{company_description}\n公司要求：{company_requirements}\n\n请为{applicant_name}生成一个热情积极的邮件主题行。要求：\n1. 简洁明了，不超过50个字符\n2. 包含公司名称\n3. 体现热情和期待\n4. 积极正面\n5. 不要包含特殊字符\n6. 使用中文\n\n请直接输出主题行，不要包含任何说明文字。"
-            }
-    else:  # english
-        if mode == 'professional':
-            return {
-                "system_prompt": "You are a professional career advisor, skilled in writing high-quality cover letters. You need to generate personalized cover letters based on the candidate's resume and company information. Please refer to LSE CV guidelines best practices to ensure the letter is professional, targeted, and highlights the candidate's strengths. The generated content should be concise email body text, without address, date, or other formatting information.",
-                "user_prompt_template": "Candidate Resume Content:\n{resume_content}\n\nTarget Company: {company_name}\nCompany Description: {company_description}\nCompany Requirements: {company_requirements}\n\nPlease generate a professional cover letter email body for {applicant_name}. Requirements:\n1. Start with personalization, mentioning the company name\n2. Highlight the match between candidate and company requirements\n3. Professional, concise, and persuasive language\n4. End with expression of interest in the opportunity\n5. Keep within 200-300 words\n6. Do not include address, date, or other formatting information\n7. Write in English\n\nPlease output the cover letter content directly, without any explanatory text.",
-                "subject_prompt_template": "Candidate Resume Content:\n{resume_content}\n\nTarget Company: {company_name}\nCompany Description: {company_description}\nCompany Requirements: {company_requirements}\n\nPlease generate a professional email subject line for {applicant_name}. Requirements:\n1. Concise and clear, no more than 50 characters\n2. Include company name\n3. Reflect job application intent\n4. Professional and formal\n5. No special characters\n6. Write in English\n\nPlease output the subject line directly, without any explanatory text."
-            }
-        else:  # enthusiastic
-            return {
-                "system_prompt": "You are an enthusiastic career advisor, skilled in writing compelling cover letters. You need to generate personalized cover letters based on the candidate's resume and company information. Please refer to LSE CV guidelines while making the language more positive and enthusiastic, showcasing the candidate's learning enthusiasm and growth potential. The generated content should be concise email body text, without address, date, or other formatting information.",
-                "user_prompt_template": "Candidate Resume Content:\n{resume_content}\n\nTarget Company: {company_name}\nCompany Description: {company_description}\nCompany Requirements: {company_requirements}\n\nPlease generate an enthusiastic and positive cover letter email body for {applicant_name}. Requirements:\n1. Show enthusiasm and interest in the company\n2. Highlight the candidate's learning ability and growth potential\n3. Positive and engaging language\n4. Express strong anticipation for the internship opportunity\n5. Keep within 200-300 words\n6. Do not include address, date, or other formatting information\n7. Write in English\n\nPlease output the cover letter content directly, without any explanatory text.",
-                "subject_prompt_template": "Candidate Resume Content:\n{resume_content}\n\nTarget Company: {company_name}\nCompany Description: {company_description}\nCompany Requirements: {company_requirements}\n\nPlease generate an enthusiastic and positive email subject line for {applicant_name}. Requirements:\n1. Concise and clear, no more than 50 characters\n2. Include company name\n3. Reflect enthusiasm and anticipation\n4. Positive and upbeat\n5. No special characters\n6. Write in English\n\nPlease output the subject line directly, without any explanatory text."
-            }
+    # 非professional模式都按enthusiastic处理
+    return _PROMPTS[(language, "professional" if mode == "professional" else "enthusiastic")]
+
+def _build_prompt_values(resume_content: str, company_name: str, company_description: str,
+                         company_requirements: str, applicant_name: str) -> dict:
+    """构建prompt模板的占位符取值，供format_map直接使用"""
+    return {
+        "resume_content": resume_content,
+        "company_name": company_name,
+        "company_description": company_description,
+        "company_requirements": company_requirements,
+        "applicant_name": applicant_name,
+    }
 
 def clean_cover_letter_content(content: str) -> str:
     """
@@ -172,32 +363,20 @@ def clean_cover_letter_content(content: str) -> str:
     if not content:
         return content
     
-    lines = content.split('\n')
-    cleaned_lines = []
-    
-    for line in lines:
-        # 跳过Subject行（各种可能的格式）
-        if re.match(r'^[Ss]ubject\s*:', line.strip()):
-            continue
-        if re.match(r'^主题\s*:', line.strip()):
-            continue
-        if re.match(r'^邮件主题\s*:', line.strip()):
-            continue
-        
-        # 跳过空行（如果前面已经有内容）
-        if not line.strip() and cleaned_lines:
-            continue
-            
-        cleaned_lines.append(line)
-    
-    # 重新组合并清理
-    cleaned_content = '\n'.join(cleaned_lines).strip()
-    
-    # 移除开头和结尾的多余空行
-    cleaned_content = re.sub(r'^\s*\n+', '', cleaned_content)
-    cleaned_content = re.sub(r'\n+\s*$', '', cleaned_content)
+    # 跳过Subject行（各种可能的格式）
+    lines = [line for line in content.splitlines()
+             if not _RE_SUBJECT_ANY.match(line.strip())]
     
-    return cleaned_content
+    # 连续空行合并为一行，保留段落间隔
+    cleaned_lines = []
+    for has_text, group in itertools.groupby(lines, key=lambda line: bool(line.strip())):
+        if has_text:
+            cleaned_lines.extend(group)
+        else:
+            cleaned_lines.append('')
+    
+    # 重新组合，strip同时去掉开头和结尾的多余空行
+    return '\n'.join(cleaned_lines).strip()
 
 def load_cover_letter_config():
     """加载cover letter配置文件"""
@@ -230,29 +409,129 @@ def get_cover_letter_mode(config, mode_name=None):
         default_mode = config.get("default_mode", "professional")
         return config["cover_letter_modes"][default_mode]
 
+@functools.lru_cache(maxsize=32)
+def _extract_pdf_text_cached(path: str, mtime_ns: int) -> str:
+    """提取PDF文本（按路径和修改时间缓存，文件变化后自动失效）"""
+    if fitz is not None:
+        try:
+            with fitz.open(path) as doc:
+                return "\n".join(page.get_text("text") for page in doc)
+        except Exception as e:
+            print(f"⚠️  PyMuPDF提取失败，改用pdfplumber: {e}")
+    
+    # 简历只有几页，逐页提取即可；不在已有GUI线程、模型的进程中再fork子进程
+    with pdfplumber.open(path) as pdf:
+        return "\n".join(p.extract_text() or "" for p in pdf.pages)
+
+def _truncate_resume(text: str, max_chars: int = RESUME_MAX_CHARS) -> str:
+    """截断过长的简历文本，尽量在行尾处截断，减少prompt长度"""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > max_chars // 2 else max_chars]
+
 def extract_pdf_text(path: str) -> str:
     """提取PDF文本"""
-    text = []
     try:
-        with pdfplumber.open(path) as pdf:
-            for p in pdf.pages:
-                t = p.extract_text() or ""
-                text.append(t)
-        return "\n".join(text)
+        abs_path = os.path.abspath(path)
+        return _extract_pdf_text_cached(abs_path, os.stat(abs_path).st_mtime_ns)
     except Exception as e:
         print(f"⚠️  提取PDF文本失败: {e}")
         return ""
 
-def chat(model, tok, messages, max_new=512):
-    """Qwen模型对话包装器"""
-    prompt = tok.apply_chat_template(messages, tokenize=False,
-                                     add_generation_prompt=True)
-    inputs = tok([prompt], return_tensors="pt").to(model.device)
-    with torch.no_grad():
-        ids = model.generate(**inputs, max_new_tokens=max_new)
-    reply_ids = ids[0][inputs.input_ids.shape[1]:]
+def _is_vllm(model) -> bool:
+    """判断模型是否为vLLM引擎"""
+    return LLM is not None and isinstance(model, LLM)
+
+def _vllm_generate(model, tok, list_of_messages, max_new):
+    """通过vLLM一次性生成多个对话的回复（max_new可为每个对话单独指定的列表）"""
+    prompts = [tok.apply_chat_template(messages, tokenize=False,
+                                       add_generation_prompt=True)
+               for messages in list_of_messages]
+    limits = _per_prompt_limits(max_new, len(prompts))
+    params = [SamplingParams(max_tokens=limit, temperature=0.7, top_p=0.8) for limit in limits]
+    with _GEN_LOCK:
+        outputs = model.generate(prompts, params, use_tqdm=False)
+    return [out.outputs[0].text.strip() for out in outputs]
+
+def _is_llama_cpp(model) -> bool:
+    """判断模型是否为llama.cpp量化模型"""
+    return Llama is not None and isinstance(model, Llama)
+
+def _llama_cpp_chat(model, messages, max_new):
+    """通过llama.cpp的chat completion接口生成回复"""
+    with _GEN_LOCK:
+        result = model.create_chat_completion(messages=messages, max_tokens=max_new,
+                                              temperature=0.7, top_p=0.8)
+    return result["choices"][0]["message"]["content"].strip()
+
+class _StopOnNewline(StoppingCriteria):
+    """单行输出（如邮件主题）生成到换行即停止，避免生成多余内容"""
+    
+    def __init__(self, tok, prompt_len, min_new=10):
+        self.tok = tok
+        self.prompt_len = prompt_len
+        self.min_new = min_new
+    
+    def __call__(self, input_ids, scores, **kwargs):
+        if input_ids.shape[1] - self.prompt_len < self.min_new:
+            return False
+        return "\n" in self.tok.decode(input_ids[0, -1:], skip_special_tokens=True)
+
+def chat(model, tok, messages, max_new=512, single_line=False):
+    """Qwen模型对话包装器（single_line=True时遇到换行提前停止）"""
+    if _is_vllm(model):
+        return _vllm_generate(model, tok, [messages], max_new)[0]
+    if _is_llama_cpp(model):
+        return _llama_cpp_chat(model, messages, max_new)
+    # 直接由chat模板得到token id，省去中间字符串再编码一次
+    input_ids = tok.apply_chat_template(messages, tokenize=True,
+                                        add_generation_prompt=True,
+                                        return_tensors="pt").to(model.device)
+    stopping = None
+    if single_line:
+        stopping = StoppingCriteriaList([_StopOnNewline(tok, input_ids.shape[1])])
+    ids = _generate(model, input_ids=input_ids,
+                    attention_mask=torch.ones_like(input_ids),
+                    max_new_tokens=max_new, use_cache=True,
+                    eos_token_id=tok.eos_token_id,
+                    pad_token_id=tok.pad_token_id or tok.eos_token_id,
+                    stopping_criteria=stopping)
+    reply_ids = ids[0][input_ids.shape[1]:]
     return tok.decode(reply_ids, skip_special_tokens=True).strip()
 
+def _per_prompt_limits(max_new, count):
+    """把max_new（整数或每个对话一个值的序列）展开为每个对话的最大生成长度"""
+    if isinstance(max_new, int):
+        return [max_new] * count
+    limits = list(max_new)
+    if len(limits) != count:
+        raise ValueError(f"max_new数量({len(limits)})与对话数量({count})不一致")
+    return limits
+
+def chat_batch(model, tok, list_of_messages, max_new=512):
+    """Qwen模型批量对话包装器，多个对话共用一次generate调用
+    
+    max_new可以是整数，也可以为每个对话单独指定（如(512, 128)），逐个生成的后端按各自上限生成。
+    """
+    limits = _per_prompt_limits(max_new, len(list_of_messages))
+    if _is_vllm(model):
+        return _vllm_generate(model, tok, list_of_messages, limits)
+    if _is_llama_cpp(model):
+        return [_llama_cpp_chat(model, messages, limit)
+                for messages, limit in zip(list_of_messages, limits)]
+    prompts = [tok.apply_chat_template(messages, tokenize=False,
+                                       add_generation_prompt=True)
+               for messages in list_of_messages]
+    inputs = tok(prompts, return_tensors="pt", padding=True).to(model.device)
+    # 同一次generate按最长上限生成，较短上限的对话截取到各自上限
+    ids = _generate(model, **inputs, max_new_tokens=max(limits), use_cache=True,
+                    eos_token_id=tok.eos_token_id,
+                    pad_token_id=tok.pad_token_id)
+    input_len = inputs.input_ids.shape[1]
+    return [tok.decode(row[input_len:input_len + limit], skip_special_tokens=True).strip()
+            for row, limit in zip(ids, limits)]
+
 def parse_subject_output(raw_output: str) -> str:
     """
     解析和处理模型生成的subject输出
@@ -270,20 +549,20 @@ def parse_subject_output(raw_output: str) -> str:
     subject = raw_output.strip()
     
     # 移除可能的引号
-    subject = re.sub(r'^["\']|["\']$', '', subject)
+    subject = _RE_QUOTES.sub('', subject)
     
     # 移除可能的"Subject:"前缀
-    subject = re.sub(r'^[Ss]ubject\s*:\s*', '', subject)
+    subject = _RE_SUBJECT_PREFIX.sub('', subject)
     
     # 移除换行符和多余空格
-    subject = re.sub(r'\s+', ' ', subject)
+    subject = _RE_WHITESPACE.sub(' ', subject)
     
     # 限制长度（邮件主题通常不超过50个字符）
     if len(subject) > 50:
         subject = subject[:47] + "..."
     
     # 移除特殊字符（保留中文、英文、数字、空格、连字符、括号）
-    subject = re.sub(r'[^\w\s\-\(\)（）\u4e00-\u9fff]', '', subject)
+    subject = _RE_SUBJECT_INVALID.sub('', subject)
     
     # 确保不为空
     if not subject.strip():
@@ -324,7 +603,7 @@ def generate_email_subject(applicant_name, cv_filename, company_name, company_de
         print(f"⚠️  CV文件不存在: {cv_path}")
         return f"Internship Application – {company_name}"
     
-    resume_content = extract_pdf_text(cv_path)
+    resume_content = _truncate_resume(extract_pdf_text(cv_path))
     if not resume_content:
         print("⚠️  无法提取简历内容")
         return f"Internship Application – {company_name}"
@@ -332,13 +611,8 @@ def generate_email_subject(applicant_name, cv_filename, company_name, company_de
     # 加载模型（如果未提供）
     should_load_model = model is None or tok is None
     if should_load_model:
-        print("▶ 加载Qwen模型...")
         try:
-            tok = AutoTokenizer.from_pretrained(
-                MODEL_DIR, trust_remote_code=True, local_files_only=True)
-            model = AutoModelForCausalLM.from_pretrained(
-                MODEL_DIR, trust_remote_code=True, local_files_only=True,
-                device_map="auto", torch_dtype="auto").eval()
+            model, tok = _get_model()
         except Exception as e:
             print(f"❌ 模型加载失败: {e}")
             return f"Internship Application – {company_name}"
@@ -348,17 +622,13 @@ def generate_email_subject(applicant_name, cv_filename, company_name, company_de
     sys_msg = {"role": "system", "content": prompt_config["system_prompt"]}
     
     # 使用模板生成用户消息
-    user_content = prompt_config["subject_prompt_template"].format(
-        resume_content=resume_content,
-        company_name=company_name,
-        company_description=company_description,
-        company_requirements=company_requirements,
-        applicant_name=applicant_name
-    )
+    prompt_values = _build_prompt_values(resume_content, company_name, company_description,
+                                         company_requirements, applicant_name)
+    user_content = prompt_config["subject_prompt_template"].format_map(prompt_values)
     usr_msg = {"role": "user", "content": user_content}
     
     try:
-        raw_subject = chat(model, tok, [sys_msg, usr_msg], max_new=128)
+        raw_subject = chat(model, tok, [sys_msg, usr_msg], max_new=128, single_line=True)
         subject = parse_subject_output(raw_subject)
         print(f"✓ 邮件主题生成完成: {subject}")
         return subject
@@ -392,19 +662,14 @@ def generate_cover_letter(applicant_name, cv_filename, company_name, company_des
         print(f"⚠️  CV文件不存在: {cv_path}")
         return None
     
-    resume_content = extract_pdf_text(cv_path)
+    resume_content = _truncate_resume(extract_pdf_text(cv_path))
     if not resume_content:
         print("⚠️  无法提取简历内容")
         return None
     
     # 加载模型
-    print("▶ 加载Qwen模型...")
     try:
-        tok = AutoTokenizer.from_pretrained(
-            MODEL_DIR, trust_remote_code=True, local_files_only=True)
-        model = AutoModelForCausalLM.from_pretrained(
-            MODEL_DIR, trust_remote_code=True, local_files_only=True,
-            device_map="auto", torch_dtype="auto").eval()
+        model, tok = _get_model()
     except Exception as e:
         print(f"❌ 模型加载失败: {e}")
         return None
@@ -414,13 +679,9 @@ def generate_cover_letter(applicant_name, cv_filename, company_name, company_des
     sys_msg = {"role": "system", "content": prompt_config["system_prompt"]}
     
     # 使用模板生成用户消息
-    user_content = prompt_config["user_prompt_template"].format(
-        resume_content=resume_content,
-        company_name=company_name,
-        company_description=company_description,
-        company_requirements=company_requirements,
-        applicant_name=applicant_name
-    )
+    prompt_values = _build_prompt_values(resume_content, company_name, company_description,
+                                         company_requirements, applicant_name)
+    user_content = prompt_config["user_prompt_template"].format_map(prompt_values)
     usr_msg = {"role": "user", "content": user_content}
     
     try:
@@ -451,9 +712,13 @@ def generate_cover_letter_and_subject(applicant_name, cv_filename, company_name,
     """
     print(f"🎯 为 {applicant_name} 处理 {company_name} 的cover letter和邮件主题...")
     
+    # 缓存只加载一次，检查和保存共用
+    cache_data = load_cached_cover_letters(applicant_name)
+    
     # 检查缓存（除非强制重新生成）
     if not force_regenerate:
-        cached_letter, cached_subject, cached_mode, cached_cv = get_cached_cover_letter(applicant_name, company_name)
+        cached_letter, cached_subject, cached_mode, cached_cv = get_cached_cover_letter(
+            applicant_name, company_name, _cache=cache_data)
         
         # 如果缓存存在且CV文件相同，直接返回缓存结果
         if cached_letter and cached_cv == cv_filename:
@@ -472,50 +737,39 @@ def generate_cover_letter_and_subject(applicant_name, cv_filename, company_name,
         print(f"⚠️  CV文件不存在: {cv_path}")
         return None, f"Internship Application – {company_name}"
     
-    resume_content = extract_pdf_text(cv_path)
+    resume_content = _truncate_resume(extract_pdf_text(cv_path))
     if not resume_content:
         print("⚠️  无法提取简历内容")
         return None, f"Internship Application – {company_name}"
     
-    # 加载模型（只加载一次）
-    print("▶ 加载Qwen模型...")
+    # 加载模型（进程内只加载一次）
     try:
-        tok = AutoTokenizer.from_pretrained(
-            MODEL_DIR, trust_remote_code=True, local_files_only=True)
-        model = AutoModelForCausalLM.from_pretrained(
-            MODEL_DIR, trust_remote_code=True, local_files_only=True,
-            device_map="auto", torch_dtype="auto").eval()
+        model, tok = _get_model()
     except Exception as e:
         print(f"❌ 模型加载失败: {e}")
         return None, f"Internship Application – {company_name}"
     
-    # 生成cover letter
-    print("▶ 生成cover letter...")
+    # 同时生成cover letter和subject（一次批量generate调用）
+    print("▶ 生成cover letter和邮件主题...")
     sys_msg = {"role": "system", "content": prompt_config["system_prompt"]}
     
-    user_content = prompt_config["user_prompt_template"].format(
-        resume_content=resume_content,
-        company_name=company_name,
-        company_description=company_description,
-        company_requirements=company_requirements,
-        applicant_name=applicant_name
-    )
-    usr_msg = {"role": "user", "content": user_content}
+    prompt_values = _build_prompt_values(resume_content, company_name, company_description,
+                                         company_requirements, applicant_name)
+    usr_msg = {"role": "user", "content": prompt_config["user_prompt_template"].format_map(prompt_values)}
+    subject_msg = {"role": "user", "content": prompt_config["subject_prompt_template"].format_map(prompt_values)}
     
     try:
-        raw_cover_letter = chat(model, tok, [sys_msg, usr_msg], max_new=512)
+        raw_cover_letter, raw_subject = chat_batch(
+            model, tok, [[sys_msg, usr_msg], [sys_msg, subject_msg]], max_new=(512, 128))
         # 清理cover letter内容
         cover_letter = clean_cover_letter_content(raw_cover_letter)
         print(f"✓ Cover letter生成完成")
+        subject = parse_subject_output(raw_subject)
+        print(f"✓ 邮件主题生成完成: {subject}")
     except Exception as e:
         print(f"❌ Cover letter生成失败: {e}")
         cover_letter = None
-    
-    # 生成subject
-    subject = generate_email_subject(
-        applicant_name, cv_filename, company_name, company_description, 
-        company_requirements, mode, model, tok
-    )
+        subject = f"Internship Application – {company_name}"
     
     # 保存到缓存
     if cover_letter:
@@ -523,19 +777,31 @@ def generate_cover_letter_and_subject(applicant_name, cv_filename, company_name,
     
     return cover_letter, subject
 
+def _get_company_index() -> dict:
+    """获取公司名称到公司信息的索引（Excel文件未修改时复用缓存）"""
+    mtime = os.stat(EXCEL_PATH).st_mtime_ns
+    if _COMPANY_CACHE["mtime"] != mtime:
+        # 解析完立即关闭工作簿，避免Windows上文件句柄锁住companyInfo.xlsx
+        with pd.ExcelFile(EXCEL_PATH) as xls:
+            company_df = xls.parse(0).fillna("")
+        index = {}
+        for row in company_df.to_dict("records"):
+            # 同名公司保留第一条记录
+            index.setdefault(str(row["公司名称"]).strip(), {
+                "description": str(row.get("简介", "")),
+                "requirements": str(row.get("要求", "")),
+                "hr_email": str(row.get("hr邮箱", ""))
+            })
+        _COMPANY_CACHE["index"] = index
+        _COMPANY_CACHE["mtime"] = mtime
+    return _COMPANY_CACHE["index"]
+
 def get_company_info(company_name):
     """从Excel文件获取公司信息"""
     try:
-        company_df = pd.read_excel(EXCEL_PATH).fillna("")
-        
-        # 查找匹配的公司
-        for _, row in company_df.iterrows():
-            if str(row["公司名称"]).strip() == company_name.strip():
-                return {
-                    "description": str(row.get("简介", "")),
-                    "requirements": str(row.get("要求", "")),
-                    "hr_email": str(row.get("hr邮箱", ""))
-                }
+        info = _get_company_index().get(company_name.strip())
+        if info:
+            return dict(info)
         
         return {"description": "", "requirements": "", "hr_email": ""}
     except Exception as e:
@@ -571,21 +837,18 @@ def delete_cached_cover_letter(applicant_name: str, company_name: str):
         print(f"⚠️  没有找到缓存文件: {cache_file}")
         return
     
-    # 加载现有缓存
-    cache_data = load_cached_cover_letters(applicant_name)
-    
-    if company_name in cache_data:
-        del cache_data[company_name]
-        
-        # 保存更新后的缓存
+    # 在现有缓存的副本上删除并保存，写入成功后才替换内存镜像
+    with _CACHE_LOCK:
+        cache_data = _load_cached_locked(applicant_name)
+        if company_name not in cache_data:
+            print(f"⚠️  没有找到 {company_name} 的缓存")
+            return
+        cache_data = {k: v for k, v in cache_data.items() if k != company_name}
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            _write_cache_file(applicant_name, cache_data)
             print(f"✓ 删除缓存: {company_name}")
         except Exception as e:
             print(f"❌ 删除缓存失败: {e}")
-    else:
-        print(f"⚠️  没有找到 {company_name} 的缓存")
 
 def generate_cover_letter_with_custom_template(applicant_name, cv_filename, company_name, company_description, company_requirements, custom_template, force_regenerate=False):
     """
@@ -605,9 +868,13 @@ def generate_cover_letter_with_custom_template(applicant_name, cv_filename, comp
     """
     print(f"🎯 为 {applicant_name} 使用自定义模板处理 {company_name} 的cover letter...")
     
+    # 缓存只加载一次，检查和保存共用
+    cache_data = load_cached_cover_letters(applicant_name)
+    
     # 检查缓存（除非强制重新生成）
     if not force_regenerate:
-        cached_letter, cached_subject, cached_mode, cached_cv = get_cached_cover_letter(applicant_name, company_name)
+        cached_letter, cached_subject, cached_mode, cached_cv = get_cached_cover_letter(
+            applicant_name, company_name, _cache=cache_data)
         
         # 如果缓存存在且CV文件相同，直接返回缓存结果
         if cached_letter and cached_cv == cv_filename:
@@ -623,19 +890,14 @@ def generate_cover_letter_with_custom_template(applicant_name, cv_filename, comp
         print(f"⚠️  CV文件不存在: {cv_path}")
         return None, f"求职申请 - {applicant_name} - {company_name}"
     
-    resume_content = extract_pdf_text(cv_path)
+    resume_content = _truncate_resume(extract_pdf_text(cv_path))
     if not resume_content:
         print("⚠️  无法提取简历内容")
         return None, f"求职申请 - {applicant_name} - {company_name}"
     
     # 加载模型
-    print("▶ 加载Qwen模型...")
     try:
-        tok = AutoTokenizer.from_pretrained(
-            MODEL_DIR, trust_remote_code=True, local_files_only=True)
-        model = AutoModelForCausalLM.from_pretrained(
-            MODEL_DIR, trust_remote_code=True, local_files_only=True,
-            device_map="auto", torch_dtype="auto").eval()
+        model, tok = _get_model()
     except Exception as e:
         print(f"❌ 模型加载失败: {e}")
         return None, f"求职申请 - {applicant_name} - {company_name}"
@@ -722,31 +984,24 @@ Please generate a professional email subject line for {applicant_name}. Requirem
 
 Please output the subject line directly, without any explanatory text."""
     
-    # 生成cover letter
-    print("▶ 生成cover letter...")
+    # 同时生成cover letter和subject（一次批量generate调用）
+    print("▶ 生成cover letter和邮件主题...")
     sys_msg = {"role": "system", "content": system_prompt}
     usr_msg = {"role": "user", "content": user_prompt}
+    sys_msg_subject = {"role": "system", "content": "You are a professional career advisor, skilled in generating email subject lines for job applications."}
+    usr_msg_subject = {"role": "user", "content": subject_prompt}
     
     try:
-        raw_cover_letter = chat(model, tok, [sys_msg, usr_msg], max_new=512)
+        raw_cover_letter, raw_subject = chat_batch(
+            model, tok, [[sys_msg, usr_msg], [sys_msg_subject, usr_msg_subject]], max_new=(512, 128))
         # 清理cover letter内容
         cover_letter = clean_cover_letter_content(raw_cover_letter)
         print(f"✓ Cover letter生成完成")
-    except Exception as e:
-        print(f"❌ Cover letter生成失败: {e}")
-        cover_letter = None
-    
-    # 生成subject
-    print("▶ 生成邮件主题...")
-    sys_msg_subject = {"role": "system", "content": "You are a professional career advisor, skilled in generating email subject lines for job applications."}
-    usr_msg_subject = {"role": "user", "content": subject_prompt}
-    
-    try:
-        raw_subject = chat(model, tok, [sys_msg_subject, usr_msg_subject], max_new=100)
         subject = parse_subject_output(raw_subject)
         print(f"✓ 邮件主题生成完成: {subject}")
     except Exception as e:
-        print(f"❌ 邮件主题生成失败: {e}")
+        print(f"❌ Cover letter生成失败: {e}")
+        cover_letter = None
         subject = f"求职申请 - {applicant_name} - {company_name}"
     
     # 保存到缓存
@@ -9,34 +9,103 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
+from tkinter import font as tkfont
 import threading
+import queue
 import os
 import sys
-import pandas as pd
 import json
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
+import hashlib
+import itertools
+import atexit
+import platform
+import time
+import sqlite3
+from contextlib import closing, contextmanager
 from datetime import datetime
-import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from openpyxl import Workbook, load_workbook
+
+# orjson为可选依赖：读写模板文件更快，未安装时使用标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 # from dotenv import load_dotenv
 
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.companyMatch import run_company_match
-from src.coverLetterGenerator import (
-    generate_cover_letter_and_subject, 
-    generate_cover_letter_with_custom_template,
-    get_company_info, 
-    list_cached_cover_letters,
-    delete_cached_cover_letter
-)
-from src.company_db import company_db
-from src.smart_excel_parser import smart_excel_parser
+# 匹配、生成、数据库等模块较重，在用到的方法中再导入，加快界面启动
+
+COMPANY_ROWS_PER_BATCH = 200  # 公司列表每次插入的行数，滚动到底部时再追加
+COMPANY_TREE_BINDTAG = "CompanyCheckTree"  # 公司勾选列表共用的绑定标签
+CLICK_COALESCE_MS = 20  # 连续点击勾选列时合并处理的时间窗口（毫秒）
+UI_POLL_MS = 50  # 主线程处理后台任务界面回调的间隔（毫秒），期间的多次进度更新只显示最新一条
+PROGRESS_TICK_MS = 120  # 进度窗口中进度条动画的刷新间隔（毫秒）
+TASK_POOL_WORKERS = 4  # 发送/测试等后台任务的最大并发数
+MATCH_CACHE_TTL = 300  # 公司匹配结果缓存有效期（秒）
+COMPANY_INFO_TTL = 300  # 公司信息缓存有效期（秒）
+COMPANY_INFO_NEGATIVE_TTL = 600  # 网络查询公司信息失败后，在此时间内（秒）不再重试
+COVER_LETTER_FLUSH_MS = 2000  # Cover Letter缓存修改后延迟写盘的时间（毫秒）
+# 打开简历文件的系统命令，平台在导入时确定一次
+OPEN_FILE_CMD = {"Darwin": ["open"], "Windows": ["start"]}.get(platform.system(), ["xdg-open"])
+EMPLOYEE_CACHE_DB = "input/.cache/employees.sqlite"  # 员工Excel解析结果缓存
+EMPLOYEE_COLUMNS = ("Name", "CV", "Duration", "Remote/Onsite")  # 员工文件中使用的列
+COMPANY_INFO_FILE = "input/companyInfo.xlsx"  # 公司信息Excel
+COMPANY_XLSX_COLUMNS = ("公司名称", "简介", "要求", "hr邮箱")  # 公司信息Excel中使用的列
+FONT_FAMILIES = ('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto',
+                 'Helvetica Neue', 'Arial')  # 界面字体优先级
+
+
+def _cache_key(*parts):
+    """由若干字符串/字节拼接生成持久化缓存键（BLAKE2b，进程间稳定，不可用内置hash()）"""
+    data = b"|".join(p.encode("utf-8") if isinstance(p, str) else p for p in parts)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _cover_letter_generator():
+    """首次生成时才导入Cover Letter生成模块，之后直接返回生成函数"""
+    from src.coverLetterGenerator import generate_cover_letter_and_subject
+    return generate_cover_letter_and_subject
+
+
+@lru_cache(maxsize=1)
+def _company_info_fetcher():
+    """首次需要从网络查询公司信息时才导入companyMatch"""
+    from src.companyMatch import get_company_info
+    return get_company_info
+
+
+@lru_cache(maxsize=1)
+def _load_company_dataframe(path, file_key):
+    """解析公司信息Excel（按路径和文件缓存键缓存最近一次结果），返回(DataFrame, 列表显示用的行)"""
+    import pandas as pd
+    # 只解析用到的列，且不做类型推断（pandas的openpyxl引擎本身以只读模式打开工作簿）
+    df = pd.read_excel(path, engine="openpyxl", dtype=str,
+                       usecols=lambda c: c in COMPANY_XLSX_COLUMNS)
+    df = df.reindex(columns=list(COMPANY_XLSX_COLUMNS))
+    
+    # 列表显示值：简介截断到50字，按列一次完成
+    rows = df.fillna("")
+    desc = rows["简介"]
+    rows["简介"] = desc.str.slice(0, 50) + desc.str.len().gt(50).map({True: "...", False: ""})
+    return df, list(rows.itertuples(index=False, name=None))
+
 
 class IntegratedGUI:
+    # 按钮配色：kind -> (背景色, 按下时背景色)
+    _BTN_STYLES = {
+        'primary': {'bg': '#7BAFD4', 'activebackground': '#6395C0'},
+        'secondary': {'bg': '#6C757D', 'activebackground': '#5a6268'},
+        'danger': {'bg': '#dc3545', 'activebackground': '#c82333'},
+        'success': {'bg': '#28a745', 'activebackground': '#218838'},
+        'info': {'bg': '#17a2b8', 'activebackground': '#138496'},
+    }
+    
     def __init__(self, root):
         self.root = root
         self.root.title("智能邮件发送系统")
@@ -44,6 +113,7 @@ class IntegratedGUI:
         
         # 初始化属性
         self.companies = []
+        self._refresh_pending = False  # 文件夹树和公司列表的刷新已排队
         self.company_folders = {}  # 添加这个属性
         self.current_folder = None  # 当前选中的文件夹
         
@@ -55,7 +125,57 @@ class IntegratedGUI:
         
         # 初始化数据存储
         self.employees = []
+        self._employees_by_name = {}  # 姓名 -> 员工信息
         self.templates = {}
+        self._emp_cache_key = None  # 员工文件(mtime, size)，未变化时跳过重新解析
+        self._tpl_cache_key = None  # 模板文件(mtime, size)
+        self._templates_hash = None  # 模板文件内容摘要，内容未变化时跳过保存
+        self._next_tid = itertools.count(1)  # 新模板ID序号，删除模板后也不会重复
+        
+        # 附件内容缓存：路径 -> (修改时间, 文件内容)，同一份简历只读一次
+        self._attachment_cache = {}
+        # 已确认存在的简历路径，重复查看时不再访问文件系统
+        self._existing_resumes = set()
+        # 文件写入线程，单线程保证多次保存按顺序完成
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        # 按钮触发的发送/测试任务共用线程池，限制同时进行的SMTP会话数
+        self._task_pool = ThreadPoolExecutor(max_workers=TASK_POOL_WORKERS, thread_name_prefix="sah")
+        # Cover Letter生成线程：模型全进程共用一份，多个公司的生成任务排队依次执行
+        self._gen_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sah-gen")
+        # 后台线程需要操作界面时放入此队列，由主线程定时统一执行
+        self._ui_q = queue.Queue()
+        # 公司匹配结果缓存：(员工姓名, 模式) -> (时间, 匹配结果)
+        self._match_cache = {}
+        # 公司信息缓存：公司名称 -> (时间, 公司信息)；同一公司同时只有一个线程在查询
+        self._company_info_cache = {}
+        self._company_info_pending = {}
+        self._company_info_lock = threading.Lock()
+        # 网络查询失败的公司：公司名称 -> 可再次查询的时间
+        self._company_neg = {}
+        # 数据库中的匹配结果缓存：员工姓名 -> 公司列表，重新匹配或公司修改后失效
+        self._matched_cache = {}
+        # 邮件配置缓存：(文件缓存键, 配置)
+        self._email_config = None
+        # 模板列表行号 -> 模板ID，与模板列表框同步
+        self._template_order = []
+        # Cover Letter缓存：员工姓名 -> (文件修改时间, 缓存数据)；修改先记在内存，延迟统一写盘
+        self._cl_cache_mem = {}
+        self._cl_dirty = {}  # 员工姓名 -> 待写盘的公司名称集合
+        self._cl_flush_job = None
+        self._cl_lock = threading.Lock()
+        atexit.register(self._flush_cl_cache)
+        
+        # 发件凭据只在启动和保存邮件配置时读取一次
+        self._reload_smtp_creds()
+        # 待处理的勾选切换：[(树形视图, 行iid)]，短时间内的多次点击合并为一次刷新
+        self._pending_toggles = []
+        self._toggle_job = None
+        self._companies_version = 0  # 公司数据修改计数，用于使分组缓存失效
+        self._companies_by_category_cache = None
+        self._companies_cache_version = None
+        # id(公司) -> (公司, 显示列)，公司数据修改后清空
+        self._company_display_cache = {}
+        self._position_categories = None
         self.current_cover_letter = None
         self.current_company = None
         self.current_subject = None
@@ -64,9 +184,44 @@ class IntegratedGUI:
         style = ttk.Style()
         style.theme_use('clam')
         
+        # 字体只创建一次，所有控件共用
+        self.create_fonts()
+        
+        # 公司勾选列表的点击事件只绑定一次，各树形视图通过绑定标签共用
+        self.root.bind_class(COMPANY_TREE_BINDTAG, '<Button-1>', self._on_company_tree_click)
+        self._drain_ui_queue()
+        
         # 创建主界面
         self.create_main_interface()
         
+    def create_fonts(self):
+        """创建界面使用的命名字体（按优先级选择系统中可用的字体族）"""
+        available = set(tkfont.families(self.root))
+        family = next((f for f in FONT_FAMILIES if f in available),
+                      tkfont.nametofont('TkDefaultFont').actual('family'))
+        
+        def make(size, weight='normal'):
+            return tkfont.Font(root=self.root, family=family, size=size, weight=weight)
+        
+        self.font_small = make(9)
+        self.font_caption = make(10)
+        self.font_body = make(11)
+        self.font_body_bold = make(11, 'bold')
+        self.font_large = make(12)
+        self.font_large_bold = make(12, 'bold')
+        self.font_subtitle = make(14)
+        self.font_subtitle_bold = make(14, 'bold')
+        self.font_title = make(16, 'bold')
+        self.font_display = make(24, 'bold')
+    
+    def _mk_button(self, parent, text, command, kind='primary', **extra):
+        """创建统一风格的扁平按钮"""
+        options = dict(font=self.font_body, fg='#FFFFFF', activeforeground='#FFFFFF',
+                       relief='flat', bd=0, cursor='hand2')
+        options.update(self._BTN_STYLES[kind])
+        options.update(extra)
+        return tk.Button(parent, text=text, command=command, **options)
+    
     def create_login_screen(self):
         """创建登录界面"""
         # 清空主窗口
@@ -81,7 +236,7 @@ class IntegratedGUI:
         title_label = tk.Label(
             login_frame, 
             text="智能邮件发送系统", 
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 24, 'bold'),
+            font=self.font_display,
             bg='#F8F9FA',
             fg='#212529'
         )
@@ -90,7 +245,7 @@ class IntegratedGUI:
         subtitle_label = tk.Label(
             login_frame, 
             text="管理员登录", 
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 14),
+            font=self.font_subtitle,
             bg='#F8F9FA',
             fg='#6C757D'
         )
@@ -102,11 +257,11 @@ class IntegratedGUI:
         
         # 管理员密钥输入 - 使用新的样式
         tk.Label(form_frame, text="管理员密钥:", 
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12), 
+                font=self.font_large, 
                 bg='#F8F9FA', fg='#212529').pack(pady=8)
         self.key_var = tk.StringVar()
         key_entry = tk.Entry(form_frame, textvariable=self.key_var, show="*", 
-                           font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12), 
+                           font=self.font_large, 
                            width=35, relief='flat', bd=1, highlightthickness=1,
                            bg='#FFFFFF', fg='#212529', insertbackground='#7BAFD4',
                            highlightbackground='#DEE2E6', highlightcolor='#7BAFD4')
@@ -114,20 +269,13 @@ class IntegratedGUI:
         key_entry.focus()
         
         # 登录按钮 - 使用新的UNC蓝色
-        login_button = tk.Button(
+        login_button = self._mk_button(
             form_frame,
             text="登录",
             command=self.authenticate,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold'),
-            bg='#7BAFD4',
-            fg='#FFFFFF',
-            activebackground='#6395C0',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
+            font=self.font_large_bold,
             width=25,
-            height=2,
-            cursor='hand2'
+            height=2
         )
         login_button.pack(pady=25)
         
@@ -159,25 +307,19 @@ class IntegratedGUI:
         title_label = tk.Label(
             title_frame, 
             text="智能邮件发送系统 - 管理员界面", 
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 16, 'bold'),
+            font=self.font_title,
             bg='#7BAFD4',
             fg='#FFFFFF'
         )
         title_label.pack(side='left', padx=25, pady=20)
         
         # 退出按钮 - 使用新的样式
-        logout_button = tk.Button(
+        logout_button = self._mk_button(
             title_frame,
             text="退出登录",
             command=self.logout,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 10),
-            bg='#dc3545',
-            fg='#FFFFFF',
-            activebackground='#c82333',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='danger',
+            font=self.font_caption
         )
         logout_button.pack(side='right', padx=25, pady=20)
         
@@ -187,83 +329,65 @@ class IntegratedGUI:
         nav_frame.pack_propagate(False)
         
         # 员工管理按钮 - 使用新的UNC蓝色
-        self.employee_btn = tk.Button(
+        self.employee_btn = self._mk_button(
             nav_frame,
             text="员工管理",
             command=self.show_employee_management,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold'),
-            bg='#7BAFD4',
-            fg='#FFFFFF',
-            activebackground='#6395C0',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
+            font=self.font_large_bold,
             width=18,
-            height=2,
-            cursor='hand2'
+            height=2
         )
         self.employee_btn.pack(side='left', padx=15, pady=10)
         
         # 模板管理按钮 - 使用新的样式
-        self.template_btn = tk.Button(
+        self.template_btn = self._mk_button(
             nav_frame,
             text="Cover Letter模板管理",
             command=self.show_template_management,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold'),
-            bg='#6C757D',
-            fg='#FFFFFF',
-            activebackground='#5a6268',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
+            kind='secondary',
+            font=self.font_large_bold,
             width=22,
-            height=2,
-            cursor='hand2'
+            height=2
         )
         self.template_btn.pack(side='left', padx=15, pady=10)
         
         # 邮件配置管理按钮 - 使用新的样式
-        self.email_config_btn = tk.Button(
+        self.email_config_btn = self._mk_button(
             nav_frame,
             text="邮件配置管理",
             command=self.show_email_config_management,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold'),
-            bg='#6C757D',
-            fg='#FFFFFF',
-            activebackground='#5a6268',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
+            kind='secondary',
+            font=self.font_large_bold,
             width=18,
-            height=2,
-            cursor='hand2'
+            height=2
         )
         self.email_config_btn.pack(side='left', padx=15, pady=10)
         
         # 新增：公司管理按钮 - 使用新的样式
-        self.company_btn = tk.Button(
+        self.company_btn = self._mk_button(
             nav_frame,
             text="公司管理",
             command=self.show_company_management,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold'),
-            bg='#6C757D',
-            fg='#FFFFFF',
-            activebackground='#5a6268',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
+            kind='secondary',
+            font=self.font_large_bold,
             width=18,
-            height=2,
-            cursor='hand2'
+            height=2
         )
         self.company_btn.pack(side='left', padx=15, pady=10)
         
+        # 员工管理按钮以primary样式创建，即初始选中项
+        self._nav_buttons = (self.employee_btn, self.template_btn, self.email_config_btn, self.company_btn)
+        self._active_nav = self.employee_btn
+        
         # 主内容区域 - 使用新的背景色
         self.main_content = tk.Frame(self.root, bg='#F8F9FA')
         self.main_content.pack(fill='both', expand=True, padx=25, pady=15)
         
-        # 加载数据
-        self.load_data()
+        # 各页面首次显示时创建，之后切换只隐藏/显示
+        self._panels = {}
+        
+        # 后台加载数据，窗口先绘制，数据就绪后再刷新列表
+        threading.Thread(target=self._load_data_bg, daemon=True).start()
         
         # 默认显示员工管理
         self.show_employee_management()
@@ -278,122 +402,279 @@ class IntegratedGUI:
             # 只在出错时显示错误信息
             print(f"数据加载错误: {str(e)}")
     
+    def _load_data_bg(self):
+        """后台线程读取员工和模板文件，读取结果交回主线程应用"""
+        try:
+            employees = self._read_employees()
+        except Exception as e:
+            print(f"员工数据加载错误: {str(e)}")
+            employees = (None, [])
+        try:
+            templates = self._read_templates()
+        except Exception as e:
+            print(f"模板数据加载错误: {str(e)}")
+            templates = (None, {}, None)
+        self._post_ui(self._apply_loaded_data, employees, templates)
+    
+    def _apply_loaded_data(self, employees, templates):
+        """在主线程中应用后台加载的数据并刷新已存在的列表"""
+        try:
+            if employees is not None:
+                self._emp_cache_key, self.employees = employees
+                self._rebuild_employee_index()
+            if templates is not None:
+                self._apply_templates(*templates)
+        except Exception as e:
+            print(f"数据加载错误: {str(e)}")
+        
+        if hasattr(self, 'employee_tree') and self.employee_tree.winfo_exists():
+            self.refresh_employee_list()
+        if hasattr(self, 'template_listbox') and self.template_listbox.winfo_exists():
+            self.refresh_template_list()
+    
+    @staticmethod
+    def _file_cache_key(path):
+        """文件缓存键：(修改时间, 文件大小)"""
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    
     def load_employees(self):
         """加载员工数据"""
         try:
-            if os.path.exists(self.EMPLOYEE_FILE):
-                df = pd.read_excel(self.EMPLOYEE_FILE)
-                
-                # 转换现有格式到新格式
-                self.employees = []
-                for idx, row in df.iterrows():
-                    employee = {
-                        "姓名": row.get("Name", ""),
-                        "简历文件": f"{row.get('CV', '')}.pdf",  # 添加.pdf后缀
-                        "实习时长": row.get("Duration", ""),
-                        "工作方式": row.get("Remote/Onsite", "")
-                    }
-                    self.employees.append(employee)
-                
-                # 静默加载，不显示终端输出
-            else:
-                # 如果文件不存在，创建空的员工列表
-                self.employees = []
-                
+            result = self._read_employees()
+            if result is not None:
+                self._emp_cache_key, self.employees = result
         except Exception as e:
             # 只在出错时显示错误信息
             print(f"员工数据加载错误: {str(e)}")
             self.employees = []
+        self._rebuild_employee_index()
     
-    def load_templates(self):
-        """加载模板数据"""
+    def _rebuild_employee_index(self):
+        """重建姓名到员工信息的索引（重名时保留第一个，与原先的顺序查找一致）"""
+        index = {}
+        for emp in self.employees:
+            index.setdefault(emp.get("姓名"), emp)
+        self._employees_by_name = index
+    
+    def _read_employees(self):
+        """读取员工文件，返回(缓存键, 员工列表)；文件未变化时返回None（不访问界面，可在后台线程调用）"""
+        if not os.path.exists(self.EMPLOYEE_FILE):
+            # 如果文件不存在，创建空的员工列表
+            return None, []
+        
+        key = self._file_cache_key(self.EMPLOYEE_FILE)
+        if key == self._emp_cache_key and self.employees:
+            return None
+        
+        # Excel未修改时直接读取上次解析结果
+        employees = self._load_employee_cache(key)
+        if employees is not None:
+            return key, employees
+        
+        # 只读模式逐行读取，不需要构建DataFrame
+        wb = load_workbook(self.EMPLOYEE_FILE, read_only=True, data_only=True)
         try:
-            if os.path.exists(self.TEMPLATE_FILE):
-                with open(self.TEMPLATE_FILE, 'r', encoding='utf-8') as f:
-                    self.templates = json.load(f)
-                # 静默加载，不显示终端输出
+            ws = wb.active
+            headers = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            idx = {h: i for i, h in enumerate(headers) if h is not None}
+            # 列位置只解析一次，缺失的列取空字符串
+            positions = [idx.get(column) for column in EMPLOYEE_COLUMNS]
+            
+            # 只读取所需列所在的范围，其余列不解析
+            found = [i for i in positions if i is not None]
+            if found:
+                first, last = min(found), max(found)
+                positions = [None if i is None else i - first for i in positions]
+                rows = ws.iter_rows(min_row=2, min_col=first + 1, max_col=last + 1, values_only=True)
             else:
-                # 如果文件不存在，创建默认模板
-                self.templates = {
-                    "professional": {
-                        "name": "专业模板",
-                        "content": "尊敬的{company_name}招聘团队：\n\n我是{applicant_name}，非常希望能够加入贵公司的团队。\n\n{company_description}\n\n我相信我的技能和经验能够满足贵公司的要求：\n{company_requirements}\n\n期待您的回复！\n\n此致\n敬礼\n{applicant_name}"
-                    },
-                    "enthusiastic": {
-                        "name": "热情模板", 
-                        "content": "亲爱的{company_name}团队：\n\n我是{applicant_name}，对贵公司充满热情！\n\n{company_description}\n\n我迫不及待想要为贵公司贡献我的技能：\n{company_requirements}\n\n让我们携手共创美好未来！\n\n此致\n敬礼\n{applicant_name}"
-                    }
+                rows = iter(())
+            
+            def pick(row):
+                return ["" if i is None or i >= len(row) or row[i] is None else row[i]
+                        for i in positions]
+            
+            # 转换现有格式到新格式
+            employees = [
+                {
+                    "姓名": name,
+                    "简历文件": f"{cv}.pdf",  # 添加.pdf后缀
+                    "实习时长": duration,
+                    "工作方式": work_mode
                 }
-                self.save_templates()
-                # 静默创建，不显示终端输出
-                
+                for name, cv, duration, work_mode in map(pick, rows)
+                if name or cv or duration or work_mode
+            ]
+        finally:
+            wb.close()
+        self._save_employee_cache(key, employees)
+        return key, employees
+    
+    def _load_employee_cache(self, key):
+        """从sqlite缓存读取员工数据；缓存不存在或与Excel文件不一致时返回None"""
+        if not os.path.exists(EMPLOYEE_CACHE_DB):
+            return None
+        try:
+            with closing(sqlite3.connect(EMPLOYEE_CACHE_DB)) as conn:
+                meta = conn.execute("SELECT mtime_ns, size FROM source").fetchone()
+                if meta is None or tuple(meta) != tuple(key):
+                    return None
+                rows = conn.execute(
+                    "SELECT name, cv_file, duration, work_mode FROM employees ORDER BY pos").fetchall()
+        except sqlite3.Error as e:
+            print(f"员工缓存读取失败: {str(e)}")
+            return None
+        return [
+            {"姓名": name, "简历文件": cv_file, "实习时长": duration, "工作方式": work_mode}
+            for name, cv_file, duration, work_mode in rows
+        ]
+    
+    def _save_employee_cache(self, key, employees):
+        """将解析后的员工数据写入sqlite缓存（Excel仍是数据源，缓存可随时删除）"""
+        try:
+            os.makedirs(os.path.dirname(EMPLOYEE_CACHE_DB), exist_ok=True)
+            with closing(sqlite3.connect(EMPLOYEE_CACHE_DB)) as conn, conn:
+                conn.execute("DROP TABLE IF EXISTS employees")
+                conn.execute("DROP TABLE IF EXISTS source")
+                conn.execute("CREATE TABLE employees(pos INTEGER PRIMARY KEY, name, cv_file, duration, work_mode)")
+                conn.execute("CREATE TABLE source(mtime_ns INTEGER, size INTEGER)")
+                conn.executemany(
+                    "INSERT INTO employees VALUES (?, ?, ?, ?, ?)",
+                    [(pos, e["姓名"], e["简历文件"], e["实习时长"], e["工作方式"])
+                     for pos, e in enumerate(employees)])
+                conn.execute("INSERT INTO source VALUES (?, ?)", key)
+        except (sqlite3.Error, OSError) as e:
+            print(f"员工缓存写入失败: {str(e)}")
+    
+    def load_templates(self):
+        """加载模板数据"""
+        try:
+            result = self._read_templates()
+            if result is not None:
+                self._apply_templates(*result)
         except Exception as e:
             # 只在出错时显示错误信息
             print(f"模板数据加载错误: {str(e)}")
             self.templates = {}
     
+    def _read_templates(self):
+        """读取模板文件，返回(缓存键, 模板, 内容摘要)；文件不存在时模板为None，文件未变化时返回None"""
+        if not os.path.exists(self.TEMPLATE_FILE):
+            return None, None, None
+        
+        key = self._file_cache_key(self.TEMPLATE_FILE)
+        if key == self._tpl_cache_key and self.templates:
+            return None
+        with open(self.TEMPLATE_FILE, 'rb') as f:
+            data = f.read()
+        templates = orjson.loads(data) if orjson is not None else json.loads(data.decode('utf-8'))
+        return key, templates, self._templates_digest(data)
+    
+    def _apply_templates(self, key, templates, digest):
+        """应用读取到的模板数据（模板为None时创建默认模板）"""
+        if templates is not None:
+            self.templates = templates
+            self._tpl_cache_key = key
+            self._templates_hash = digest
+            self._reset_template_ids()
+            return
+        
+        # 如果文件不存在，创建默认模板
+        self.templates = {
+            "professional": {
+                "name": "专业模板",
+                "content": "尊敬的{company_name}招聘团队：\n\n我是{applicant_name}，非常希望能够加入贵公司的团队。\n\n{company_description}\n\n我相信我的技能和经验能够满足贵公司的要求：\n{company_requirements}\n\n期待您的回复！\n\n此致\n敬礼\n{applicant_name}"
+            },
+            "enthusiastic": {
+                "name": "热情模板", 
+                "content": "亲爱的{company_name}团队：\n\n我是{applicant_name}，对贵公司充满热情！\n\n{company_description}\n\n我迫不及待想要为贵公司贡献我的技能：\n{company_requirements}\n\n让我们携手共创美好未来！\n\n此致\n敬礼\n{applicant_name}"
+            }
+        }
+        self.save_templates()
+        # 静默创建，不显示终端输出
+    
     def save_templates(self):
         """保存模板数据"""
         try:
-            with open(self.TEMPLATE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.templates, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                data = orjson.dumps(self.templates, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.templates, ensure_ascii=False, indent=2).encode('utf-8')
+            
+            # 内容与文件一致时跳过写入
+            digest = self._templates_digest(data)
+            if digest == self._templates_hash and os.path.exists(self.TEMPLATE_FILE):
+                return
+            
+            # 先写临时文件再替换，避免写入中断损坏模板文件
+            tmp_path = self.TEMPLATE_FILE + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.TEMPLATE_FILE)
+            self._templates_hash = digest
+            self._tpl_cache_key = self._file_cache_key(self.TEMPLATE_FILE)
         except Exception as e:
             messagebox.showerror("错误", f"保存模板数据失败: {str(e)}")
     
+    @staticmethod
+    def _templates_digest(data):
+        """模板文件内容摘要，用于判断是否需要重新写入"""
+        return hashlib.blake2b(data, digest_size=8).digest()
+    
+    def _select_nav(self, btn):
+        """切换导航按钮选中状态，只重设状态发生变化的两个按钮"""
+        if self._active_nav is btn:
+            return
+        if self._active_nav is not None:
+            self._active_nav.config(bg=self._BTN_STYLES['secondary']['bg'])
+        btn.config(bg=self._BTN_STYLES['primary']['bg'])
+        self._active_nav = btn
+    
+    def _show_panel(self, name, build):
+        """显示指定页面并隐藏其他页面；页面不存在时调用build创建"""
+        panel = self._panels.get(name)
+        if panel is None:
+            panel = tk.Frame(self.main_content, bg='#F8F9FA')
+            self._panels[name] = panel
+            build(panel)
+        for other in self._panels.values():
+            if other is not panel:
+                other.pack_forget()
+        panel.pack(fill='both', expand=True)
+    
     def show_employee_management(self):
         """显示员工管理界面"""
         # 更新按钮状态 - 使用新的颜色
-        self.employee_btn.config(bg='#7BAFD4')
-        self.template_btn.config(bg='#6C757D')
-        self.email_config_btn.config(bg='#6C757D')
-        self.company_btn.config(bg='#6C757D')
+        self._select_nav(self.employee_btn)
         
-        # 清空主内容区域
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-        
-        # 创建员工管理界面
-        self.create_employee_management_interface()
+        # 显示员工管理界面（首次显示时创建，之后保留输入和选择状态）
+        self._show_panel('employee', self.create_employee_management_interface)
         
     def show_template_management(self):
         """显示模板管理界面"""
         # 更新按钮状态 - 使用新的颜色
-        self.employee_btn.config(bg='#6C757D')
-        self.template_btn.config(bg='#7BAFD4')
-        self.email_config_btn.config(bg='#6C757D')
-        self.company_btn.config(bg='#6C757D')
-        
-        # 清空主内容区域
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
+        self._select_nav(self.template_btn)
         
-        # 创建模板管理界面
-        self.create_template_management_interface()
+        # 显示模板管理界面（首次显示时创建，之后保留输入和选择状态）
+        self._show_panel('template', self.create_template_management_interface)
     
     def show_email_config_management(self):
         """显示邮件配置管理界面"""
         # 更新按钮状态 - 使用新的颜色
-        self.employee_btn.config(bg='#6C757D')
-        self.template_btn.config(bg='#6C757D')
-        self.email_config_btn.config(bg='#7BAFD4')
-        self.company_btn.config(bg='#6C757D')
+        self._select_nav(self.email_config_btn)
         
         # 确保主界面已经创建
         if not hasattr(self, 'main_content'):
             self.create_main_interface()
             return
         
-        # 清空主内容区域
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-        
-        # 创建邮件配置管理界面
-        self.create_email_config_management_interface()
+        # 显示邮件配置管理界面（首次显示时创建，之后保留输入和选择状态）
+        self._show_panel('email', self.create_email_config_management_interface)
     
-    def create_employee_management_interface(self):
+    def create_employee_management_interface(self, parent):
         """创建员工管理界面"""
         # 左侧员工列表
-        left_frame = ttk.LabelFrame(self.main_content, text="员工列表", padding=10)
+        left_frame = ttk.LabelFrame(parent, text="员工列表", padding=10)
         left_frame.pack(side='left', fill='y', padx=(0, 10))
         
         # 员工列表（树形视图）
@@ -424,23 +705,15 @@ class IntegratedGUI:
         employee_btn_frame = tk.Frame(left_frame)
         employee_btn_frame.pack(fill='x', pady=10)
         
-        add_employee_btn = tk.Button(
+        add_employee_btn = self._mk_button(
             employee_btn_frame,
             text="添加员工",
-            command=self.add_employee,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#7BAFD4',
-            fg='#FFFFFF',
-            activebackground='#6395C0',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=self.add_employee
         )
         add_employee_btn.pack(fill='x', pady=5)
         
         # 右侧员工详情
-        right_frame = ttk.LabelFrame(self.main_content, text="员工详情", padding=10)
+        right_frame = ttk.LabelFrame(parent, text="员工详情", padding=10)
         right_frame.pack(side='right', fill='both', expand=True)
         
         # 员工信息显示区域
@@ -453,10 +726,10 @@ class IntegratedGUI:
         # 刷新员工列表
         self.refresh_employee_list()
         
-    def create_template_management_interface(self):
+    def create_template_management_interface(self, parent):
         """创建模板管理界面"""
         # 左侧模板列表
-        left_frame = ttk.LabelFrame(self.main_content, text="模板列表", padding=10)
+        left_frame = ttk.LabelFrame(parent, text="模板列表", padding=10)
         left_frame.pack(side='left', fill='y', padx=(0, 10))
         
         # 模板列表
@@ -474,38 +747,23 @@ class IntegratedGUI:
         template_btn_frame = tk.Frame(left_frame)
         template_btn_frame.pack(fill='x', pady=10)
         
-        add_template_btn = tk.Button(
+        add_template_btn = self._mk_button(
             template_btn_frame,
             text="添加模板",
-            command=self.add_template,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#7BAFD4',
-            fg='#FFFFFF',
-            activebackground='#6395C0',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=self.add_template
         )
         add_template_btn.pack(side='left', padx=5, pady=5)
         
-        delete_template_btn = tk.Button(
+        delete_template_btn = self._mk_button(
             template_btn_frame,
             text="删除模板",
             command=self.delete_template,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#dc3545',
-            fg='#FFFFFF',
-            activebackground='#c82333',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='danger'
         )
         delete_template_btn.pack(side='left', padx=5, pady=5)
         
         # 右侧模板编辑区域
-        right_frame = ttk.LabelFrame(self.main_content, text="模板编辑", padding=10)
+        right_frame = ttk.LabelFrame(parent, text="模板编辑", padding=10)
         right_frame.pack(side='right', fill='both', expand=True)
         
         # 模板名称
@@ -524,36 +782,30 @@ class IntegratedGUI:
         self.template_content_text.pack(fill='both', expand=True, pady=5)
         
         # 保存按钮 - 使用新的样式
-        save_template_btn = tk.Button(
+        save_template_btn = self._mk_button(
             right_frame,
             text="保存模板",
             command=self.save_template,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11, 'bold'),
-            bg='#28a745',
-            fg='#FFFFFF',
-            activebackground='#218838',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='success',
+            font=self.font_body_bold
         )
         save_template_btn.pack(pady=15)
         
         # 刷新模板列表
         self.refresh_template_list()
         
-    def create_email_config_management_interface(self):
+    def create_email_config_management_interface(self, parent):
         """创建邮件配置管理界面"""
         # 标题 - 使用新的字体和样式
         title_label = ttk.Label(
-            self.main_content,
+            parent,
             text="邮件配置管理",
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 16, 'bold')
+            font=self.font_title
         )
         title_label.pack(pady=15)
         
         # 配置框架
-        config_frame = ttk.LabelFrame(self.main_content, text="邮件服务器配置", padding=10)
+        config_frame = ttk.LabelFrame(parent, text="邮件服务器配置", padding=10)
         config_frame.pack(fill='x', padx=10, pady=5)
         
         # SMTP服务器设置
@@ -573,7 +825,7 @@ class IntegratedGUI:
         ttk.Checkbutton(smtp_frame, variable=self.use_tls_var).grid(row=0, column=5, padx=5)
         
         # 邮箱凭据设置
-        cred_frame = ttk.LabelFrame(self.main_content, text="邮箱凭据", padding=10)
+        cred_frame = ttk.LabelFrame(parent, text="邮箱凭据", padding=10)
         cred_frame.pack(fill='x', padx=10, pady=5)
         
         ttk.Label(cred_frame, text="邮箱地址:").pack(anchor='w', pady=2)
@@ -587,54 +839,32 @@ class IntegratedGUI:
         ttk.Label(cred_frame, text="注意：请使用应用密码而不是登录密码，确保邮件发送安全").pack(anchor='w', pady=5)
         
         # 按钮框架
-        button_frame = ttk.Frame(self.main_content)
+        button_frame = ttk.Frame(parent)
         button_frame.pack(pady=10)
         
         # 加载配置 - 使用新的样式
-        load_btn = tk.Button(
+        load_btn = self._mk_button(
             button_frame,
             text="加载配置",
             command=self.load_email_config,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#6C757D',
-            fg='#FFFFFF',
-            activebackground='#5a6268',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='secondary'
         )
         load_btn.pack(side='left', padx=8, pady=5)
         
         # 保存配置 - 使用新的样式
-        save_btn = tk.Button(
+        save_btn = self._mk_button(
             button_frame,
             text="保存配置",
-            command=self.save_email_config,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#7BAFD4',
-            fg='#FFFFFF',
-            activebackground='#6395C0',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=self.save_email_config
         )
         save_btn.pack(side='left', padx=8, pady=5)
         
         # 测试连接 - 使用新的样式
-        test_btn = tk.Button(
+        test_btn = self._mk_button(
             button_frame,
             text="测试连接",
             command=self.test_email_connection,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#28a745',
-            fg='#FFFFFF',
-            activebackground='#218838',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='success'
         )
         test_btn.pack(side='left', padx=8, pady=5)
         
@@ -642,37 +872,239 @@ class IntegratedGUI:
         self.load_email_config()
     
     def refresh_employee_list(self):
-        """刷新员工列表"""
-        # 清空现有项目
-        for item in self.employee_tree.get_children():
-            self.employee_tree.delete(item)
-        
-        # 添加员工数据
-        for employee in self.employees:
-            self.employee_tree.insert("", "end", values=(
+        """刷新员工列表（复用已有的行，只增删数量差异部分；行iid为员工在列表中的下标）"""
+        tree = self.employee_tree
+        existing = tree.get_children()
+        
+        for i, employee in enumerate(self.employees):
+            values = (
                 employee.get("姓名", ""),
                 employee.get("简历文件", ""),
                 employee.get("实习时长", ""),
                 employee.get("工作方式", "")
-            ))
+            )
+            if i < len(existing):
+                tree.item(existing[i], values=values)
+            else:
+                tree.insert("", "end", iid=str(i), values=values)
+        
+        # 删除多余的行
+        if len(existing) > len(self.employees):
+            tree.delete(*existing[len(self.employees):])
     
     def on_employee_select(self, event):
         """处理员工选择事件"""
         selection = self.employee_tree.selection()
         if selection:
-            item = self.employee_tree.item(selection[0])
-            employee_name = item['values'][0]
-            
-            # 查找员工信息
-            employee = None
-            for emp in self.employees:
-                if emp.get("姓名") == employee_name:
-                    employee = emp
-                    break
+            # 行iid即员工下标，重名员工也能区分
+            employee = self.employees[int(selection[0])]
             
             self.current_employee = employee
             self.show_employee_info(employee)
     
+    def _get_position_categories(self):
+        """获取岗位分类（只从分类器读取一次）"""
+        if self._position_categories is None:
+            from src.position_classifier import position_classifier
+            self._position_categories = position_classifier.get_all_categories()
+        return self._position_categories
+    
+    def _get_companies_by_category(self):
+        """获取按岗位大类分组的公司，公司数据变化后才重新分组"""
+        from src.company_db import company_db
+        version = (getattr(company_db, 'version', None), self._companies_version)
+        if self._companies_by_category_cache is None or version != self._companies_cache_version:
+            companies_by_category = defaultdict(list)
+            for company in company_db.get_all_companies():
+                companies_by_category[company.get('position_major_category', '未分类')].append(company)
+            self._companies_by_category_cache = dict(companies_by_category)
+            self._companies_cache_version = version
+        return self._companies_by_category_cache
+    
+    def _invalidate_company_cache(self):
+        """公司数据被修改后调用，使分组缓存失效"""
+        self._companies_version += 1
+        self._company_display_cache.clear()
+        with self._company_info_lock:
+            self._company_info_cache.clear()
+        self._matched_cache.clear()
+    
+    def _get_cached_company_info(self, company_name):
+        """返回未过期的公司信息缓存，没有时返回None（调用方需持有_company_info_lock）"""
+        entry = self._company_info_cache.get(company_name)
+        if entry is not None and time.monotonic() - entry[0] < COMPANY_INFO_TTL:
+            return entry[1]
+        return None
+    
+    def _get_company_info_cached(self, company_name, on_network=None):
+        """获取公司信息（先查数据库，没有再从网络获取），COMPANY_INFO_TTL内重复请求直接返回缓存"""
+        with self._company_info_lock:
+            info = self._get_cached_company_info(company_name)
+            if info is not None:
+                return info
+            name_lock = self._company_info_pending.setdefault(company_name, threading.Lock())
+        
+        # 同一公司的并发请求在这里等待第一个请求的结果
+        with name_lock:
+            with self._company_info_lock:
+                info = self._get_cached_company_info(company_name)
+            if info is not None:
+                return info
+            
+            from src.company_db import company_db
+            info = company_db.get_company_by_name(company_name)
+            if not info:
+                info = self._fetch_company_info(company_name, on_network)
+            
+            with self._company_info_lock:
+                self._company_info_cache[company_name] = (time.monotonic(), info)
+                self._company_info_pending.pop(company_name, None)
+        return info
+    
+    def _fetch_company_info(self, company_name, on_network=None):
+        """从网络获取公司信息；查询失败或无结果时COMPANY_INFO_NEGATIVE_TTL内直接返回空信息"""
+        if time.monotonic() < self._company_neg.get(company_name, 0):
+            return {}
+        if on_network:
+            on_network()
+        try:
+            info = _company_info_fetcher()(company_name)
+        except Exception as e:
+            print(f"⚠️ 获取公司信息失败 {company_name}: {str(e)}")
+            info = None
+        if not info:
+            self._company_neg[company_name] = time.monotonic() + COMPANY_INFO_NEGATIVE_TTL
+            return {}
+        self._company_neg.pop(company_name, None)
+        return info
+    
+    def _company_display(self, company):
+        """公司在列表中除选择列外的显示值（按公司对象缓存，同一公司只截断一次简介）"""
+        entry = self._company_display_cache.get(id(company))
+        if entry is not None and entry[0] is company:
+            return entry[1]
+        
+        # 显示公司简介
+        description = company.get('description', '')
+        if len(description) > 80:
+            description = description[:80] + "..."
+        
+        display = (
+            company.get('company_name', ''),
+            company.get('position_sub_category', ''),
+            description,
+            company.get('hr_email', '')
+        )
+        # 同时保存公司对象，保证id不会被其他对象复用
+        self._company_display_cache[id(company)] = (company, display)
+        return display
+    
+    def _company_row_values(self, company, checked):
+        """构造公司列表中一行的显示值"""
+        display = self._company_display(company)
+        return ("☑️" if display[0] in checked else "☐",) + display
+    
+    @staticmethod
+    @contextmanager
+    def _batch_update(tree):
+        """批量修改树形视图期间暂停滚动条回调，结束后恢复（只触发一次滚动条更新）"""
+        yscrollcommand = tree.cget('yscrollcommand')
+        tree.configure(yscrollcommand='')
+        try:
+            yield tree
+        finally:
+            tree.configure(yscrollcommand=yscrollcommand)
+    
+    def _load_company_rows(self, panel):
+        """向公司列表的树形视图追加当前分类的下一批行"""
+        panel._loading = False
+        if not panel.winfo_exists():
+            return
+        start = panel._loaded
+        end = min(start + COMPANY_ROWS_PER_BATCH, len(panel._companies))
+        tree = panel._tree
+        row_index = panel._row_index
+        with self._batch_update(tree):
+            for index in range(start, end):
+                company = panel._companies[index]
+                iid = str(index)
+                tree.insert("", "end", iid=iid,
+                            values=self._company_row_values(company, panel._checked))
+                row_index.setdefault(company.get('company_name', ''), []).append(iid)
+        panel._loaded = end
+    
+    def _show_company_category(self, panel, category):
+        """切换公司列表显示的岗位大类：清空树形视图后插入该分类的第一批公司"""
+        companies = panel._companies_by_category.get(category, [])
+        panel._companies = companies
+        panel._loaded = 0
+        panel._row_index = {}
+        panel._title.config(text=f"{category} - 共 {len(companies)} 家公司")
+        tree = panel._tree
+        tree.delete(*tree.get_children())
+        self._load_company_rows(panel)
+    
+    def _on_company_tree_scroll(self, panel, scrollbar, first, last):
+        """滚动条回调：接近底部且还有未插入的公司时追加下一批"""
+        scrollbar.set(first, last)
+        if (float(last) >= 0.9 and not panel._loading
+                and panel._loaded < len(panel._companies)):
+            panel._loading = True
+            self.root.after_idle(self._load_company_rows, panel)
+    
+    def _set_lazy_rows(self, tree, rows, to_values=None):
+        """设置树形视图的全部行（调用方已清空），只插入第一批，其余由_on_lazy_tree_scroll按需追加"""
+        tree._lazy_rows = rows
+        tree._lazy_values = to_values
+        tree._lazy_loaded = 0
+        self._append_lazy_rows(tree)
+    
+    def _append_lazy_rows(self, tree):
+        """向树形视图追加下一批行"""
+        tree._lazy_loading = False
+        if not tree.winfo_exists():
+            return
+        start = tree._lazy_loaded
+        end = min(start + COMPANY_ROWS_PER_BATCH, len(tree._lazy_rows))
+        insert = tree.insert
+        to_values = tree._lazy_values
+        with self._batch_update(tree):
+            for index in range(start, end):
+                row = tree._lazy_rows[index]
+                insert('', 'end', values=to_values(row) if to_values else row)
+        tree._lazy_loaded = end
+    
+    def _on_lazy_tree_scroll(self, tree, scrollbar, first, last):
+        """滚动条回调：接近底部且还有未插入的行时追加下一批"""
+        scrollbar.set(first, last)
+        rows = getattr(tree, '_lazy_rows', None)
+        if (rows is not None and float(last) >= 0.9 and not tree._lazy_loading
+                and tree._lazy_loaded < len(rows)):
+            tree._lazy_loading = True
+            self.root.after_idle(self._append_lazy_rows, tree)
+    
+    def _set_checked_companies(self, panels, names):
+        """设置勾选的公司名称（panels共用同一个勾选集合），只刷新状态发生变化且已插入的行"""
+        if not panels:
+            return
+        checked = panels[0]._checked
+        names = set(names)
+        changed = checked ^ names
+        checked.clear()
+        checked.update(names)
+        
+        for panel in panels:
+            # 公司名称 -> 已插入行的iid列表
+            row_index = panel._row_index
+            if not row_index:
+                continue
+            tree = panel._tree
+            with self._batch_update(tree):
+                for company_name in changed:
+                    mark = "☑️" if company_name in checked else "☐"
+                    for iid in row_index.get(company_name, ()):
+                        tree.set(iid, "选择", mark)
+    
     def show_employee_info(self, employee):
         """显示员工信息"""
         # 清空信息框架
@@ -684,7 +1116,7 @@ class IntegratedGUI:
             ttk.Label(
                 self.employee_info_frame,
                 text="请选择员工查看详情",
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12),
+                font=self.font_large,
                 foreground='#6C757D'
             ).pack(expand=True)
             return
@@ -700,7 +1132,7 @@ class IntegratedGUI:
         ttk.Label(
             self.employee_info_frame,
             text=info_text,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
+            font=self.font_body,
             justify='left'
         ).pack(anchor='w', pady=15)
         
@@ -709,34 +1141,19 @@ class IntegratedGUI:
         btn_frame1.pack(fill='x', pady=5)
         
         # 查看简历按钮 - 使用新的样式
-        view_resume_btn = tk.Button(
+        view_resume_btn = self._mk_button(
             btn_frame1,
             text="查看简历",
             command=lambda: self.view_resume(employee),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#6C757D',
-            fg='#FFFFFF',
-            activebackground='#5a6268',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='secondary'
         )
         view_resume_btn.pack(side='left', padx=5, fill='x', expand=True, pady=3)
         
         # 公司匹配按钮 - 使用新的样式
-        match_btn = tk.Button(
+        match_btn = self._mk_button(
             btn_frame1,
             text="公司匹配",
-            command=lambda: self.match_companies(employee),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#7BAFD4',
-            fg='#FFFFFF',
-            activebackground='#6395C0',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=lambda: self.match_companies(employee)
         )
         match_btn.pack(side='left', padx=5, fill='x', expand=True, pady=3)
         
@@ -745,34 +1162,19 @@ class IntegratedGUI:
         btn_frame2.pack(fill='x', pady=5)
         
         # 生成Cover Letter按钮 - 使用新的样式
-        generate_btn = tk.Button(
+        generate_btn = self._mk_button(
             btn_frame2,
             text="生成Cover Letter",
             command=lambda: self.generate_cover_letter(employee),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#28a745',
-            fg='#FFFFFF',
-            activebackground='#218838',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='success'
         )
         generate_btn.pack(side='left', padx=5, fill='x', expand=True, pady=3)
         
         # 发送邮件按钮 - 使用新的样式
-        send_btn = tk.Button(
+        send_btn = self._mk_button(
             btn_frame2,
             text="发送邮件",
-            command=lambda: self.send_email(employee),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#7BAFD4',
-            fg='#FFFFFF',
-            activebackground='#6395C0',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=lambda: self.send_email(employee)
         )
         send_btn.pack(side='left', padx=5, fill='x', expand=True, pady=3)
         
@@ -780,160 +1182,125 @@ class IntegratedGUI:
         companies_frame = ttk.LabelFrame(self.employee_info_frame, text="匹配公司列表", padding=10)
         companies_frame.pack(fill='both', expand=True, pady=10)
         
-        # 创建Notebook用于分页显示不同岗位大类
-        notebook = ttk.Notebook(companies_frame)
-        notebook.pack(fill='both', expand=True)
-        
         # 获取所有岗位分类（从岗位分类器获取完整的分类列表）
-        from src.position_classifier import position_classifier
-        all_categories = position_classifier.get_all_categories()
-        
-        # 获取所有公司
-        all_companies = company_db.get_all_companies()
-        
-        # 按岗位大类分组
-        companies_by_category = {}
-        for company in all_companies:
-            category = company.get('position_major_category', '未分类')
-            if category not in companies_by_category:
-                companies_by_category[category] = []
-            companies_by_category[category].append(company)
-        
-        # 为每个岗位大类创建页面（包括没有公司的分类）
-        for category in all_categories.keys():
-            companies = companies_by_category.get(category, [])
-            
-            # 创建页面框架
-            page_frame = ttk.Frame(notebook)
-            notebook.add(page_frame, text=f"{category} ({len(companies)})")
-            
-            # 页面标题
-            page_title = ttk.Label(
-                page_frame,
-                text=f"{category} - 共 {len(companies)} 家公司",
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold')
-            )
-            page_title.pack(pady=10)
-            
-            # 创建树形视图
-            columns = ("选择", "公司名称", "岗位子类", "公司简介", "HR邮箱")
-            tree = ttk.Treeview(page_frame, columns=columns, show="headings", height=15)
-            
-            tree.heading("选择", text="选择")
-            tree.heading("公司名称", text="公司名称")
-            tree.heading("岗位子类", text="岗位子类")
-            tree.heading("公司简介", text="公司简介")
-            tree.heading("HR邮箱", text="HR邮箱")
-            
-            tree.column("选择", width=60)
-            tree.column("公司名称", width=200)
-            tree.column("岗位子类", width=120)
-            tree.column("公司简介", width=300)
-            tree.column("HR邮箱", width=150)
-            
-            # 滚动条
-            scrollbar = ttk.Scrollbar(page_frame, orient="vertical", command=tree.yview)
-            tree.configure(yscrollcommand=scrollbar.set)
-            
-            tree.pack(side='left', fill='both', expand=True)
-            scrollbar.pack(side='right', fill='y')
-            
-            # 添加公司数据
-            for company in companies:
-                company_name = company.get('company_name', '')
-                
-                # 使用空白方框显示选择状态
-                selection_status = "☐"
-                
-                # 显示公司简介
-                description = company.get('description', '')
-                if len(description) > 80:
-                    description = description[:80] + "..."
-                
-                tree.insert("", "end", values=(
-                    selection_status,
-                    company_name,
-                    company.get('position_sub_category', ''),
-                    description,
-                    company.get('hr_email', '')
-                ))
-            
-            # 绑定点击事件来切换选择状态（只在选择列点击时生效）
-            tree.bind('<Button-1>', lambda e, t=tree: self.toggle_company_selection_in_tree_column(e, t))
-            
-            # 禁用行选择高亮
-            tree.tag_configure('selected', background='white', foreground='black')
+        all_categories = self._get_position_categories()
+        categories = list(all_categories.keys())
+        
+        # 按岗位大类分组的公司（公司数据未变化时复用）
+        companies_by_category = self._get_companies_by_category()
+        
+        # 岗位大类选择：所有分类共用一个树形视图，切换分类时重新填充
+        filter_frame = ttk.Frame(companies_frame)
+        filter_frame.pack(fill='x')
+        
+        ttk.Label(
+            filter_frame,
+            text="岗位大类:",
+            font=self.font_body
+        ).pack(side='left', padx=(0, 5))
+        
+        category_var = tk.StringVar(value=categories[0] if categories else "")
+        category_combo = ttk.Combobox(filter_frame, textvariable=category_var,
+                                      values=categories, state='readonly', width=30)
+        category_combo.pack(side='left')
+        
+        # 公司列表面板
+        panel = ttk.Frame(companies_frame)
+        panel.pack(fill='both', expand=True)
+        
+        # 页面标题
+        page_title = ttk.Label(
+            panel,
+            font=self.font_large_bold
+        )
+        page_title.pack(pady=10)
+        
+        # 创建树形视图
+        columns = ("选择", "公司名称", "岗位子类", "公司简介", "HR邮箱")
+        tree = ttk.Treeview(panel, columns=columns, show="headings", height=15)
+        
+        tree.heading("选择", text="选择")
+        tree.heading("公司名称", text="公司名称")
+        tree.heading("岗位子类", text="岗位子类")
+        tree.heading("公司简介", text="公司简介")
+        tree.heading("HR邮箱", text="HR邮箱")
+        
+        tree.column("选择", width=60)
+        tree.column("公司名称", width=200)
+        tree.column("岗位子类", width=120)
+        tree.column("公司简介", width=300)
+        tree.column("HR邮箱", width=150)
+        
+        # 滚动条
+        scrollbar = ttk.Scrollbar(panel, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=lambda first, last:
+                       self._on_company_tree_scroll(panel, scrollbar, first, last))
+        
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        
+        # 面板数据：全部分类的公司 + 当前分类；勾选状态按公司名称记录，切换分类不会丢失
+        panel._companies_by_category = {c: companies_by_category.get(c, []) for c in categories}
+        panel._companies = []
+        panel._tree = tree
+        panel._title = page_title
+        panel._loaded = 0
+        panel._loading = False
+        panel._row_index = {}
+        panel._checked = set()
+        tree._panel = panel
+        
+        # 绑定点击事件来切换选择状态（只在选择列点击时生效）
+        self._add_company_tree_bindtag(tree)
+        
+        # 禁用行选择高亮
+        tree.tag_configure('selected', background='white', foreground='black')
+        
+        category_combo.bind('<<ComboboxSelected>>',
+                            lambda e: self._show_company_category(panel, category_var.get()))
+        self._show_company_category(panel, category_var.get())
         
         # 操作按钮框架
         button_frame = ttk.Frame(companies_frame)
         button_frame.pack(fill='x', pady=10)
         
         # 全选按钮
-        select_all_btn = tk.Button(
+        select_all_btn = self._mk_button(
             button_frame,
             text="全选",
-            command=lambda: self.select_all_companies_in_notebook(notebook),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#28a745',
-            fg='#FFFFFF',
-            activebackground='#218838',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=lambda: self.select_all_companies_in_notebook(panel),
+            kind='success'
         )
         select_all_btn.pack(side='left', padx=5, pady=5)
         
         # 取消全选按钮
-        deselect_all_btn = tk.Button(
+        deselect_all_btn = self._mk_button(
             button_frame,
             text="取消全选",
-            command=lambda: self.deselect_all_companies_in_notebook(notebook),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#6C757D',
-            fg='#FFFFFF',
-            activebackground='#5a6268',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=lambda: self.deselect_all_companies_in_notebook(panel),
+            kind='secondary'
         )
         deselect_all_btn.pack(side='left', padx=5, pady=5)
         
         # 为选中公司生成Cover Letter按钮
-        generate_btn = tk.Button(
+        generate_btn = self._mk_button(
             button_frame,
             text="为选中公司生成Cover Letter",
-            command=lambda: self.generate_for_selected_companies_in_notebook(employee, notebook),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#17a2b8',
-            fg='#FFFFFF',
-            activebackground='#138496',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=lambda: self.generate_for_selected_companies_in_notebook(employee, panel),
+            kind='info'
         )
         generate_btn.pack(side='left', padx=5, pady=5)
         
         # 为选中公司发送邮件按钮
-        send_btn = tk.Button(
+        send_btn = self._mk_button(
             button_frame,
             text="为选中公司发送邮件",
-            command=lambda: self.send_to_selected_companies_in_notebook(employee, notebook),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#7BAFD4',
-            fg='#FFFFFF',
-            activebackground='#6395C0',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            command=lambda: self.send_to_selected_companies_in_notebook(employee, panel)
         )
         send_btn.pack(side='left', padx=5, pady=5)
         
-        # 保存notebook引用以便后续使用
-        self.companies_notebook = notebook
+        # 保存公司列表面板引用以便后续使用
+        self.companies_panel = panel
         
         # 公司操作按钮框架
         company_btn_frame = tk.Frame(self.employee_info_frame)
@@ -1035,6 +1402,7 @@ class IntegratedGUI:
             }
             
             self.employees.append(new_employee)
+            self._rebuild_employee_index()
             
             # 保存到Excel（保持原有格式）
             self.save_employees_to_excel()
@@ -1054,24 +1422,49 @@ class IntegratedGUI:
     def save_employees_to_excel(self):
         """保存员工数据到Excel文件（保持原有格式）"""
         try:
-            # 转换为原有格式
-            excel_data = []
-            for emp in self.employees:
-                excel_data.append({
-                    "Name": emp.get("姓名", ""),
-                    "Duration": emp.get("实习时长", ""),
-                    "Remote/Onsite": emp.get("工作方式", ""),
-                    "CV": emp.get("简历文件", "").replace(".pdf", "")  # 移除.pdf后缀
-                })
+            # 转换为原有格式（列顺序：Name, Duration, Remote/Onsite, CV）
+            rows = [
+                (
+                    emp.get("姓名", ""),
+                    emp.get("实习时长", ""),
+                    emp.get("工作方式", ""),
+                    emp.get("简历文件", "").replace(".pdf", "")  # 移除.pdf后缀
+                )
+                for emp in self.employees
+            ]
             
-            df = pd.DataFrame(excel_data)
-            df.to_excel(self.EMPLOYEE_FILE, index=False)
-            print(f"✓ 员工数据已保存到 {self.EMPLOYEE_FILE}")
+            # 数据快照在主线程生成，写文件交给后台线程
+            future = self._io_pool.submit(self._write_employees_excel, rows)
+            future.add_done_callback(
+                lambda f: self._post_ui(self._on_employees_saved, f))
             
         except Exception as e:
             print(f"✗ 保存员工数据失败: {str(e)}")
             messagebox.showerror("错误", f"保存员工数据失败: {str(e)}")
     
+    def _write_employees_excel(self, rows):
+        """写入员工Excel文件（在后台线程中执行，不访问界面）"""
+        # 只写模式逐行写出，不构建DataFrame和完整的工作表对象
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(("Name", "Duration", "Remote/Onsite", "CV"))
+        for row in rows:
+            ws.append(row)
+        
+        # 先写临时文件再替换，写入失败时不会损坏原文件
+        tmp_path = self.EMPLOYEE_FILE + ".tmp"
+        wb.save(tmp_path)
+        os.replace(tmp_path, self.EMPLOYEE_FILE)
+    
+    def _on_employees_saved(self, future):
+        """员工数据写入完成后在主线程报告结果"""
+        error = future.exception()
+        if error is not None:
+            print(f"✗ 保存员工数据失败: {str(error)}")
+            messagebox.showerror("错误", f"保存员工数据失败: {str(error)}")
+            return
+        print(f"✓ 员工数据已保存到 {self.EMPLOYEE_FILE}")
+    
     def view_resume(self, employee):
         """查看简历"""
         resume_file = employee.get("简历文件", "")
@@ -1080,40 +1473,36 @@ class IntegratedGUI:
             return
         
         resume_path = os.path.join("CV", resume_file)
-        if not os.path.exists(resume_path):
-            messagebox.showerror("错误", f"简历文件不存在: {resume_path}")
-            return
+        if resume_path not in self._existing_resumes:
+            if not os.path.exists(resume_path):
+                messagebox.showerror("错误", f"简历文件不存在: {resume_path}")
+                return
+            self._existing_resumes.add(resume_path)
         
         # 尝试打开PDF文件
         try:
             import subprocess
-            import platform
-            
-            if platform.system() == "Darwin":  # macOS
-                subprocess.run(["open", resume_path])
-            elif platform.system() == "Windows":
-                subprocess.run(["start", resume_path], shell=True)
-            else:  # Linux
-                subprocess.run(["xdg-open", resume_path])
+            
+            # Windows的start是shell内置命令
+            subprocess.run(OPEN_FILE_CMD + [resume_path], shell=OPEN_FILE_CMD[0] == "start")
         except Exception as e:
             messagebox.showinfo("提示", f"简历文件位置: {resume_path}\n\n请手动打开文件。")
     
     def match_companies(self, employee):
         """公司匹配 - 直接运行匹配并更新checkbox状态"""
+        from src.company_db import company_db
         if not employee:
             messagebox.showwarning("警告", "请先选择员工！")
             return
         
         try:
-            # 直接运行匹配（使用默认的flexible模式）
-            from src.companyMatch import run_company_match
-            
-            # 运行匹配
-            matched_companies = run_company_match(employee['姓名'], 'flexible')
+            # 直接运行匹配（使用默认的flexible模式），用户主动匹配时总是重新计算
+            matched_companies = self._run_company_match(employee['姓名'], 'flexible', refresh=True)
             
             if matched_companies:
                 # 保存匹配结果到数据库
                 company_db.save_matching_results(employee['姓名'], matched_companies, 'flexible')
+                self._matched_cache.pop(employee['姓名'], None)
                 
                 # 更新checkbox状态
                 self.update_checkbox_states(employee['姓名'], matched_companies)
@@ -1126,31 +1515,30 @@ class IntegratedGUI:
         except Exception as e:
             messagebox.showerror("匹配错误", f"匹配过程中出现错误: {str(e)}")
     
+    def _run_company_match(self, employee_name, mode='flexible', refresh=False):
+        """运行公司匹配；MATCH_CACHE_TTL内重复请求同一员工时直接返回上次结果"""
+        key = (employee_name, mode)
+        now = time.monotonic()
+        cached = self._match_cache.get(key)
+        if not refresh and cached is not None and now - cached[0] < MATCH_CACHE_TTL:
+            return cached[1]
+        
+        from src.companyMatch import run_company_match
+        matched_companies = run_company_match(employee_name, mode)
+        self._match_cache[key] = (now, matched_companies)
+        return matched_companies
+    
     def update_checkbox_states(self, employee_name, matched_companies):
         """更新checkbox状态 - 将推荐的公司标记为选中"""
         try:
             # 提取推荐公司名称列表
             recommended_names = [company.get('公司名称', company.get('company_name', '')) for company in matched_companies]
             
-            # 检查是否有notebook
-            if hasattr(self, 'companies_notebook') and self.companies_notebook:
-                # 遍历所有页面
-                for tab_id in self.companies_notebook.tabs():
-                    page = self.companies_notebook.nametowidget(tab_id)
-                    # 找到页面中的树形视图
-                    for widget in page.winfo_children():
-                        if isinstance(widget, ttk.Treeview):
-                            tree = widget
-                            for item in tree.get_children():
-                                current_values = tree.item(item, 'values')
-                                if current_values:
-                                    company_name = current_values[1]
-                                    # 检查是否是推荐的公司
-                                    is_recommended = company_name in recommended_names
-                                    new_selection = "☑️" if is_recommended else "☐"
-                                    new_values = (new_selection,) + current_values[1:]
-                                    tree.item(item, values=new_values)
-                            break
+            # 检查是否有公司列表面板
+            if (hasattr(self, 'companies_panel') and self.companies_panel
+                    and self.companies_panel.winfo_exists()):
+                # 推荐的公司标记为选中，其余取消
+                self._set_checked_companies([self.companies_panel], recommended_names)
             
             print(f"✓ 已更新 {employee_name} 的checkbox状态，推荐了 {len(recommended_names)} 家公司")
             
@@ -1161,11 +1549,7 @@ class IntegratedGUI:
         """显示匹配结果"""
         try:
             # 获取员工信息
-            employee = None
-            for emp in self.employees:
-                if emp['姓名'] == employee_name:
-                    employee = emp
-                    break
+            employee = self._employees_by_name.get(employee_name)
             
             if not employee:
                 messagebox.showerror("错误", "未找到员工信息！")
@@ -1174,8 +1558,7 @@ class IntegratedGUI:
             # 如果没有提供推荐公司列表，则运行匹配获取
             if recommended_names is None:
                 try:
-                    from src.companyMatch import run_company_match
-                    recommended_companies = run_company_match(employee_name, 'flexible')
+                    recommended_companies = self._run_company_match(employee_name, 'flexible')
                     recommended_names = [company.get('公司名称', company.get('company_name', '')) for company in recommended_companies]
                 except:
                     recommended_names = []
@@ -1184,16 +1567,8 @@ class IntegratedGUI:
             from src.position_classifier import position_classifier
             all_categories = position_classifier.get_all_categories()
             
-            # 获取所有公司
-            all_companies = company_db.get_all_companies()
-            
-            # 按岗位大类分组
-            companies_by_category = {}
-            for company in all_companies:
-                category = company.get('position_major_category', '未分类')
-                if category not in companies_by_category:
-                    companies_by_category[category] = []
-                companies_by_category[category].append(company)
+            # 获取按岗位大类分组的公司（与公司列表面板共用缓存）
+            companies_by_category = self._get_companies_by_category()
             
             # 创建结果窗口
             result_window = tk.Toplevel(self.root)
@@ -1208,7 +1583,7 @@ class IntegratedGUI:
             title_label = ttk.Label(
                 main_frame, 
                 text=f"为 {employee_name} 匹配结果 - 推荐 {len(recommended_names)} 家公司",
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 14, 'bold')
+                font=self.font_subtitle_bold
             )
             title_label.pack(pady=15)
             
@@ -1216,152 +1591,115 @@ class IntegratedGUI:
             notebook = ttk.Notebook(main_frame)
             notebook.pack(fill='both', expand=True, pady=10)
             
-            # 为每个岗位大类创建页面（包括没有公司的分类）
+            # 为每个岗位大类创建页面（包括没有公司的分类），页面只作为容器
             for category in all_categories.keys():
                 companies = companies_by_category.get(category, [])
                 # 创建页面框架
                 page_frame = ttk.Frame(notebook)
                 notebook.add(page_frame, text=f"{category} ({len(companies)})")
-                
-                # 页面标题
-                page_title = ttk.Label(
-                    page_frame,
-                    text=f"{category} - 共 {len(companies)} 家公司",
-                    font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold')
-                )
-                page_title.pack(pady=10)
-                
-                # 创建树形视图
-                columns = ("选择", "公司名称", "岗位子类", "公司简介", "HR邮箱")
-                tree = ttk.Treeview(page_frame, columns=columns, show="headings", height=15)
-                
-                tree.heading("选择", text="选择")
-                tree.heading("公司名称", text="公司名称")
-                tree.heading("岗位子类", text="岗位子类")
-                tree.heading("公司简介", text="公司简介")
-                tree.heading("HR邮箱", text="HR邮箱")
-                
-                tree.column("选择", width=60)
-                tree.column("公司名称", width=200)
-                tree.column("岗位子类", width=120)
-                tree.column("公司简介", width=300)
-                tree.column("HR邮箱", width=150)
-                
-                # 滚动条
-                scrollbar = ttk.Scrollbar(page_frame, orient="vertical", command=tree.yview)
-                tree.configure(yscrollcommand=scrollbar.set)
-                
-                tree.pack(side='left', fill='both', expand=True)
-                scrollbar.pack(side='right', fill='y')
-                
-                # 添加公司数据
-                for company in companies:
-                    company_name = company.get('company_name', '')
-                    is_recommended = company_name in recommended_names
-                    
-                    # 使用空白方框显示选择状态
-                    selection_status = "☑️" if is_recommended else "☐"
-                    
-                    # 显示公司简介
-                    description = company.get('description', '')
-                    if len(description) > 80:
-                        description = description[:80] + "..."
-                    
-                    tree.insert("", "end", values=(
-                        selection_status,
-                        company_name,
-                        company.get('position_sub_category', ''),
-                        description,
-                        company.get('hr_email', '')
-                    ))
-                
-                # 绑定点击事件来切换选择状态（只在选择列点击时生效）
-                tree.bind('<Button-1>', lambda e, t=tree: self.toggle_company_selection_in_tree_column(e, t))
-                
-                # 禁用行选择高亮
-                tree.tag_configure('selected', background='white', foreground='black')
+                page_frame._category = category
+            
+            # 所有页面共用一个树形视图，切换页面时移入当前页面并换成该分类的公司
+            page_title = ttk.Label(notebook, font=self.font_large_bold)
+            
+            # 创建树形视图
+            columns = ("选择", "公司名称", "岗位子类", "公司简介", "HR邮箱")
+            tree = ttk.Treeview(notebook, columns=columns, show="headings", height=15)
+            
+            tree.heading("选择", text="选择")
+            tree.heading("公司名称", text="公司名称")
+            tree.heading("岗位子类", text="岗位子类")
+            tree.heading("公司简介", text="公司简介")
+            tree.heading("HR邮箱", text="HR邮箱")
+            
+            tree.column("选择", width=60)
+            tree.column("公司名称", width=200)
+            tree.column("岗位子类", width=120)
+            tree.column("公司简介", width=300)
+            tree.column("HR邮箱", width=150)
+            
+            # 滚动条：滚动到接近底部时再插入下一批公司
+            scrollbar = ttk.Scrollbar(notebook, orient="vertical", command=tree.yview)
+            tree.configure(yscrollcommand=lambda first, last:
+                           self._on_company_tree_scroll(notebook, scrollbar, first, last))
+            
+            # notebook作为公司列表面板：全部分类的公司 + 当前分类；勾选状态按公司名称记录，推荐公司默认勾选
+            notebook._companies_by_category = {c: companies_by_category.get(c, []) for c in all_categories}
+            notebook._companies = []
+            notebook._tree = tree
+            notebook._title = page_title
+            notebook._scrollbar = scrollbar
+            notebook._loaded = 0
+            notebook._loading = False
+            notebook._row_index = {}
+            notebook._checked = set(recommended_names)
+            tree._panel = notebook
+            
+            # 绑定点击事件来切换选择状态（只在选择列点击时生效）
+            self._add_company_tree_bindtag(tree)
+            
+            # 禁用行选择高亮
+            tree.tag_configure('selected', background='white', foreground='black')
+            
+            notebook.bind('<<NotebookTabChanged>>', self._on_matching_tab_changed)
+            if notebook.tabs():
+                self._show_matching_page(notebook)
             
             # 操作按钮框架
             button_frame = ttk.Frame(main_frame)
             button_frame.pack(fill='x', pady=10)
             
             # 全选按钮
-            select_all_btn = tk.Button(
+            select_all_btn = self._mk_button(
                 button_frame,
                 text="全选推荐公司",
                 command=lambda: self.select_all_recommended(notebook),
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-                bg='#28a745',
-                fg='#FFFFFF',
-                activebackground='#218838',
-                activeforeground='#FFFFFF',
-                relief='flat',
-                bd=0,
-                cursor='hand2'
+                kind='success'
             )
             select_all_btn.pack(side='left', padx=5, pady=5)
             
             # 取消全选按钮
-            deselect_all_btn = tk.Button(
+            deselect_all_btn = self._mk_button(
                 button_frame,
                 text="取消全选",
                 command=lambda: self.deselect_all_companies_in_tree(notebook),
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-                bg='#6C757D',
-                fg='#FFFFFF',
-                activebackground='#5a6268',
-                activeforeground='#FFFFFF',
-                relief='flat',
-                bd=0,
-                cursor='hand2'
+                kind='secondary'
             )
             deselect_all_btn.pack(side='left', padx=5, pady=5)
             
             # 生成Cover Letter按钮
-            generate_btn = tk.Button(
+            generate_btn = self._mk_button(
                 button_frame,
                 text="为选中公司生成Cover Letter",
                 command=lambda: self.generate_for_selected_companies_in_tree(employee, notebook),
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-                bg='#17a2b8',
-                fg='#FFFFFF',
-                activebackground='#138496',
-                activeforeground='#FFFFFF',
-                relief='flat',
-                bd=0,
-                cursor='hand2'
+                kind='info'
             )
             generate_btn.pack(side='left', padx=5, pady=5)
             
             # 发送邮件按钮
-            send_btn = tk.Button(
+            send_btn = self._mk_button(
                 button_frame,
                 text="为选中公司发送邮件",
-                command=lambda: self.send_to_selected_companies_in_tree(employee, notebook),
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-                bg='#7BAFD4',
-                fg='#FFFFFF',
-                activebackground='#6395C0',
-                activeforeground='#FFFFFF',
-                relief='flat',
-                bd=0,
-                cursor='hand2'
+                command=lambda: self.send_to_selected_companies_in_tree(employee, notebook)
             )
             send_btn.pack(side='left', padx=5, pady=5)
             
+            # 导出匹配结果按钮（导出数据库中保存的该员工匹配结果）
+            export_btn = self._mk_button(
+                button_frame,
+                text="导出匹配结果",
+                command=lambda: self.export_matching_results(
+                    employee_name, self.load_matched_companies(employee_name), result_window),
+                kind='secondary'
+            )
+            export_btn.pack(side='left', padx=5, pady=5)
+            
             # 关闭按钮
-            close_btn = tk.Button(
+            close_btn = self._mk_button(
                 button_frame,
                 text="关闭",
                 command=result_window.destroy,
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-                bg='#dc3545',
-                fg='#FFFFFF',
-                activebackground='#c82333',
-                activeforeground='#FFFFFF',
-                relief='flat',
-                bd=0,
-                cursor='hand2'
+                kind='danger'
             )
             close_btn.pack(side='right', padx=5, pady=5)
             
@@ -1371,6 +1709,18 @@ class IntegratedGUI:
             self.log_message(f"显示匹配结果失败: {str(e)}")
             messagebox.showerror("错误", f"显示匹配结果失败: {str(e)}")
     
+    def _on_matching_tab_changed(self, event):
+        """匹配结果切换分类页面"""
+        self._show_matching_page(event.widget)
+    
+    def _show_matching_page(self, notebook):
+        """把共用的树形视图移入当前选中的页面，并显示该页面分类的公司"""
+        page = notebook.nametowidget(notebook.select())
+        notebook._title.pack(in_=page, pady=10)
+        notebook._tree.pack(in_=page, side='left', fill='both', expand=True)
+        notebook._scrollbar.pack(in_=page, side='right', fill='y')
+        self._show_company_category(notebook, page._category)
+    
     def generate_for_selected_company(self, employee_name, tree, parent_window):
         """为选中的公司生成Cover Letter"""
         selection = tree.selection()
@@ -1383,11 +1733,7 @@ class IntegratedGUI:
         company_name = item['values'][1]  # 公司名称在第二列
         
         # 获取员工信息
-        employee = None
-        for emp in self.employees:
-            if emp['姓名'] == employee_name:
-                employee = emp
-                break
+        employee = self._employees_by_name.get(employee_name)
         
         if not employee:
             messagebox.showerror("错误", "未找到员工信息！")
@@ -1412,11 +1758,7 @@ class IntegratedGUI:
         hr_email = item['values'][4]  # HR邮箱在第五列
         
         # 获取员工信息
-        employee = None
-        for emp in self.employees:
-            if emp['姓名'] == employee_name:
-                employee = emp
-                break
+        employee = self._employees_by_name.get(employee_name)
         
         if not employee:
             messagebox.showerror("错误", "未找到员工信息！")
@@ -1434,23 +1776,33 @@ class IntegratedGUI:
     def export_matching_results(self, employee_name, matched_companies, parent_window):
         """导出匹配结果"""
         try:
+            if not matched_companies:
+                messagebox.showwarning("提示", f"员工 {employee_name} 暂无匹配结果，请先进行公司匹配", parent=parent_window)
+                return
+            
             # 选择保存路径
             filename = filedialog.asksaveasfilename(
+                parent=parent_window,
                 defaultextension=".csv",
                 filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx")],
-                initialname=f"匹配结果_{employee_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                initialfile=f"匹配结果_{employee_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             )
             
             if not filename:
                 return
             
-            # 创建DataFrame
-            df = pd.DataFrame(matched_companies)
-            
-            # 保存文件
+            # 保存文件：CSV逐行写出，不构建DataFrame
             if filename.endswith('.csv'):
-                df.to_csv(filename, index=False, encoding='utf-8-sig')
+                import csv
+                # 列为所有记录字段的并集（按首次出现顺序），与DataFrame一致
+                fieldnames = list(dict.fromkeys(key for company in matched_companies for key in company))
+                with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(matched_companies)
             else:
+                import pandas as pd
+                df = pd.DataFrame.from_records(matched_companies)
                 df.to_excel(filename, index=False)
             
             messagebox.showinfo("成功", f"匹配结果已导出到: {filename}")
@@ -1514,20 +1866,13 @@ class IntegratedGUI:
         template_combo.pack(fill='x', pady=5)
         
         # 生成按钮 - 使用新的样式
-        generate_btn = tk.Button(
+        generate_btn = self._mk_button(
             template_frame,
             text="生成Cover Letter",
             command=lambda: self.generate_cover_letter_for_company(
                 employee, company_var.get(), template_var.get(), parent
             ),
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-            bg='#28a745',
-            fg='#FFFFFF',
-            activebackground='#218838',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='success'
         )
         generate_btn.pack(pady=15)
         
@@ -1568,7 +1913,7 @@ class IntegratedGUI:
             confirm_label = ttk.Label(
                 confirm_frame,
                 text=f"确认要保存对 {company_var.get()} 的Cover Letter修改吗？",
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12),
+                font=self.font_large,
                 justify='center'
             )
             confirm_label.pack(pady=25)
@@ -1587,32 +1932,18 @@ class IntegratedGUI:
                 confirm_window.destroy()
             btn_frame = ttk.Frame(confirm_frame)
             btn_frame.pack(pady=10)
-            confirm_btn = tk.Button(
+            confirm_btn = self._mk_button(
                 btn_frame,
                 text="确认保存",
                 command=do_save,
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-                bg='#28a745',
-                fg='#FFFFFF',
-                activebackground='#218838',
-                activeforeground='#FFFFFF',
-                relief='flat',
-                bd=0,
-                cursor='hand2'
+                kind='success'
             )
             confirm_btn.pack(side='left', padx=10, pady=5)
-            cancel_btn = tk.Button(
+            cancel_btn = self._mk_button(
                 btn_frame,
                 text="取消",
                 command=cancel_save,
-                font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-                bg='#6C757D',
-                fg='#FFFFFF',
-                activebackground='#5a6268',
-                activeforeground='#FFFFFF',
-                relief='flat',
-                bd=0,
-                cursor='hand2'
+                kind='secondary'
             )
             cancel_btn.pack(side='left', padx=10, pady=5)
         
@@ -1639,7 +1970,7 @@ class IntegratedGUI:
                 title_label = ttk.Label(
                     preview_frame,
                     text=f"Cover Letter预览 - {company_var.get()}",
-                    font=('Arial', 14, 'bold')
+                    font=self.font_subtitle_bold
                 )
                 title_label.pack(pady=10)
                 
@@ -1647,8 +1978,11 @@ class IntegratedGUI:
                 subject_frame = ttk.LabelFrame(preview_frame, text="邮件主题", padding=10)
                 subject_frame.pack(fill='x', pady=5)
                 
-                subject_preview = tk.Text(subject_frame, height=2, wrap='word')
+                # 只读预览，不记录撤销信息
+                subject_preview = tk.Text(subject_frame, height=2, wrap='word',
+                                          undo=False, autoseparators=False, maxundo=0)
                 subject_preview.insert(1.0, subject)
+                subject_preview.edit_reset()
                 subject_preview.config(state='disabled')
                 subject_preview.pack(fill='x')
                 
@@ -1656,8 +1990,10 @@ class IntegratedGUI:
                 content_frame = ttk.LabelFrame(preview_frame, text="Cover Letter内容", padding=10)
                 content_frame.pack(fill='both', expand=True, pady=5)
                 
-                content_preview = scrolledtext.ScrolledText(content_frame, wrap='word')
+                content_preview = scrolledtext.ScrolledText(content_frame, wrap='word',
+                                                            undo=False, autoseparators=False, maxundo=0)
                 content_preview.insert(1.0, content)
+                content_preview.edit_reset()
                 content_preview.config(state='disabled')
                 content_preview.pack(fill='both', expand=True)
                 
@@ -1693,7 +2029,12 @@ class IntegratedGUI:
         self.result_content_text = content_text
     
     def load_matched_companies(self, employee_name):
-        """从数据库加载匹配的公司"""
+        """从数据库加载匹配的公司（结果按员工缓存）"""
+        cached = self._matched_cache.get(employee_name)
+        if cached is not None:
+            return cached
+        
+        from src.company_db import company_db
         try:
             # 从数据库获取匹配结果
             matching_results = company_db.get_matching_results(employee_name)
@@ -1703,9 +2044,8 @@ class IntegratedGUI:
                 return []
             
             # 转换为兼容格式
-            companies = []
-            for result in matching_results:
-                companies.append({
+            companies = [
+                {
                     "name": result['company_name'],
                     "hr_email": result['hr_email'],
                     "description": result['description'],
@@ -1713,18 +2053,32 @@ class IntegratedGUI:
                     "matching_mode": result['matching_mode'],
                     "is_recommended": result['is_recommended'],
                     "matching_score": result['matching_score']
-                })
+                }
+                for result in matching_results
+            ]
             
             self.log_message(f"从数据库加载了 {len(companies)} 个匹配结果")
+            self._matched_cache[employee_name] = companies
             return companies
             
         except Exception as e:
             self.log_message(f"加载匹配公司失败: {str(e)}")
             return []
     
-    def generate_cover_letter_for_company(self, employee, company_name, template_name, parent):
-        """为指定公司生成Cover Letter"""
+    def generate_cover_letter_for_company(self, employee, company_name, template_name, parent,
+                                          force_regenerate=False):
+        """为指定公司生成Cover Letter（输入未变化时直接使用缓存结果）"""
         try:
+            # 员工、公司、模板和简历文件都没有变化时跳过AI生成
+            cache_key = self._cover_letter_cache_key(employee, company_name, template_name)
+            if not force_regenerate:
+                record = self._load_cover_letter_cache(employee['姓名']).get(company_name)
+                if record and record.get("content") and record.get("cache_key") == cache_key:
+                    self.log_message(f"使用缓存的Cover Letter: {company_name}")
+                    self.show_cover_letter_result(employee, company_name, record["content"],
+                                                  record["subject"], parent, template_name)
+                    return
+            
             # 创建进度窗口
             progress_window = tk.Toplevel(parent)
             progress_window.title("生成Cover Letter")
@@ -1746,24 +2100,25 @@ class IntegratedGUI:
             title_label = tk.Label(
                 progress_frame,
                 text=f"正在为 {company_name} 生成Cover Letter",
-                font=('Arial', 12, 'bold')
+                font=self.font_large_bold
             )
             title_label.pack(pady=10)
             
             # 进度条
             progress_bar = ttk.Progressbar(
                 progress_frame,
-                mode='indeterminate',
+                mode='determinate',
+                maximum=100,
                 length=300
             )
             progress_bar.pack(pady=10)
-            progress_bar.start()
+            self._animate_progress_bar(progress_window, progress_bar)
             
             # 状态标签
             status_label = tk.Label(
                 progress_frame,
                 text="正在加载AI模型...",
-                font=('Arial', 10)
+                font=self.font_caption
             )
             status_label.pack(pady=10)
             
@@ -1771,40 +2126,31 @@ class IntegratedGUI:
             detail_label = tk.Label(
                 progress_frame,
                 text="",
-                font=('Arial', 9),
+                font=self.font_small,
                 fg='gray'
             )
             detail_label.pack(pady=5)
             
-            def update_progress(message, detail=""):
-                """更新进度信息"""
-                status_label.config(text=message)
-                if detail:
-                    detail_label.config(text=detail)
-                progress_window.update()
+            # 进度回调（可在后台线程中调用，短时间内的多次更新合并刷新）
+            update_progress = self._make_progress_reporter(progress_window, status_label, detail_label)
             
             def generate_thread():
                 """在后台线程中生成Cover Letter"""
                 try:
                     # 更新进度
-                    progress_window.after(0, lambda: update_progress("正在分析公司信息...", "获取公司简介和要求"))
+                    update_progress("正在分析公司信息...", "获取公司简介和要求")
                     
-                    # 获取公司信息
-                    company_info = company_db.get_company_by_name(company_name)
-                    if not company_info:
-                        progress_window.after(0, lambda: update_progress("正在搜索公司信息...", "从网络获取公司详情"))
-                        # 从网络获取公司信息
-                        from src.companyMatch import get_company_info
-                        company_info = get_company_info(company_name)
+                    # 获取公司信息（数据库没有时从网络获取）
+                    company_info = self._get_company_info_cached(
+                        company_name,
+                        on_network=lambda: update_progress("正在搜索公司信息...", "从网络获取公司详情"))
                     
-                    progress_window.after(0, lambda: update_progress("正在生成Cover Letter...", "使用AI模型生成个性化内容"))
+                    update_progress("正在生成Cover Letter...", "使用AI模型生成个性化内容")
                     
                     # 生成Cover Letter
-                    from src.coverLetterGenerator import generate_cover_letter_and_subject
-                    
-                    cover_letter, subject = generate_cover_letter_and_subject(
+                    cover_letter, subject = _cover_letter_generator()(
                         applicant_name=employee['姓名'],
-                        cv_filename=employee['CV'],
+                        cv_filename=self._employee_cv_filename(employee),
                         company_name=company_name,
                         company_description=company_info.get('description', ''),
                         company_requirements=company_info.get('requirements', ''),
@@ -1812,38 +2158,109 @@ class IntegratedGUI:
                         force_regenerate=True
                     )
                     
-                    progress_window.after(0, lambda: update_progress("正在保存结果...", "缓存Cover Letter内容"))
+                    # 生成失败（简历缺失、模型加载或生成出错）时不写缓存，下次重新生成
+                    if not cover_letter:
+                        self._post_ui(progress_window.destroy)
+                        self._post_ui(messagebox.showerror, "生成失败",
+                                      f"未能为 {company_name} 生成Cover Letter，请检查简历文件和AI模型")
+                        return
                     
-                    # 保存到缓存
-                    self.save_cover_letter_to_cache(employee['姓名'], company_name, cover_letter, subject)
+                    update_progress("正在保存结果...", "缓存Cover Letter内容")
                     
-                    # 关闭进度窗口
-                    progress_window.after(0, progress_window.destroy)
+                    # 保存到缓存
+                    self.save_cover_letter_to_cache(employee['姓名'], company_name, cover_letter, subject,
+                                                    cache_key=cache_key)
                     
-                    # 显示结果
-                    self.show_cover_letter_result(employee, company_name, cover_letter, subject, parent)
+                    # 关闭进度窗口并显示结果
+                    self._post_ui(progress_window.destroy)
+                    self._post_ui(self.show_cover_letter_result,
+                                  employee, company_name, cover_letter, subject, parent, template_name)
                     
                 except Exception as e:
-                    progress_window.after(0, progress_window.destroy)
-                    messagebox.showerror("生成失败", f"生成Cover Letter时出现错误: {str(e)}")
+                    self._post_ui(progress_window.destroy)
+                    self._post_ui(messagebox.showerror, "生成失败", f"生成Cover Letter时出现错误: {str(e)}")
             
-            # 启动生成线程
-            import threading
-            generate_thread_obj = threading.Thread(target=generate_thread)
-            generate_thread_obj.daemon = True
-            generate_thread_obj.start()
+            # 在生成线程中排队执行
+            self._gen_pool.submit(generate_thread)
             
         except Exception as e:
             messagebox.showerror("错误", f"启动Cover Letter生成失败: {str(e)}")
     
-    def show_cover_letter_result(self, employee, company_name, cover_letter, subject, parent):
-        """显示Cover Letter生成结果"""
+    @staticmethod
+    def _animate_progress_bar(window, bar):
+        """在界面线程中每PROGRESS_TICK_MS推进一次进度条，窗口关闭时停止"""
+        tick_id = None
+        
+        def tick():
+            nonlocal tick_id
+            bar['value'] = (bar['value'] + 3) % 100
+            tick_id = window.after(PROGRESS_TICK_MS, tick)
+        
+        def on_destroy(event):
+            if event.widget is window and tick_id is not None:
+                window.after_cancel(tick_id)
+        
+        window.bind('<Destroy>', on_destroy, add='+')
+        tick()
+    
+    def _post_ui(self, fn, *args):
+        """从任意线程提交界面操作，由主线程在下次轮询时执行"""
+        self._ui_q.put((fn, args))
+    
+    def _drain_ui_queue(self):
+        """主线程每UI_POLL_MS执行一次队列中积累的界面操作"""
+        try:
+            while True:
+                fn, args = self._ui_q.get_nowait()
+                try:
+                    fn(*args)
+                except Exception as e:
+                    print(f"界面回调执行失败: {str(e)}")
+        except queue.Empty:
+            pass
+        self.root.after(UI_POLL_MS, self._drain_ui_queue)
+    
+    def _make_progress_reporter(self, window, status_label, detail_label):
+        """创建可在后台线程调用的进度回调：每UI_POLL_MS最多刷新一次界面，始终显示最新状态"""
+        lock = threading.Lock()
+        latest = None
+        scheduled = False
+        
+        def apply():
+            nonlocal scheduled
+            with lock:
+                message, detail = latest
+                scheduled = False
+            if not window.winfo_exists():
+                return
+            status_label.config(text=message)
+            if detail:
+                detail_label.config(text=detail)
+            window.update_idletasks()
+        
+        def report(message, detail=""):
+            nonlocal latest, scheduled
+            with lock:
+                latest = (message, detail)
+                if scheduled:
+                    return
+                scheduled = True
+            self._post_ui(apply)
+        
+        return report
+    
+    def show_cover_letter_result(self, employee, company_name, cover_letter, subject, parent, template_name=None):
+        """显示Cover Letter生成结果（template_name供重新生成时使用）"""
         try:
             # 创建结果窗口
             result_window = tk.Toplevel(parent)
+            result_window.template_name = template_name
             result_window.title(f"Cover Letter - {company_name}")
             result_window.geometry("800x600")
             
+            # 匹配结果中已有HR邮箱时，发送时不再查询数据库
+            hr_email = self._matched_hr_email(employee['姓名'], company_name)
+            
             # 主框架
             main_frame = ttk.Frame(result_window, padding=10)
             main_frame.pack(fill='both', expand=True)
@@ -1852,7 +2269,7 @@ class IntegratedGUI:
             title_label = ttk.Label(
                 main_frame,
                 text=f"为 {company_name} 生成的Cover Letter",
-                font=('Arial', 14, 'bold')
+                font=self.font_subtitle_bold
             )
             title_label.pack(pady=10)
             
@@ -1863,7 +2280,7 @@ class IntegratedGUI:
             subject_label = ttk.Label(
                 subject_frame,
                 text=subject,
-                font=('Arial', 11),
+                font=self.font_body,
                 wraplength=700
             )
             subject_label.pack()
@@ -1876,11 +2293,15 @@ class IntegratedGUI:
             text_frame = ttk.Frame(content_frame)
             text_frame.pack(fill='both', expand=True)
             
+            # 只读显示（发送和保存使用生成的原文），不记录撤销信息
             text_widget = tk.Text(
                 text_frame,
                 wrap='word',
-                font=('Arial', 10),
-                height=20
+                font=self.font_caption,
+                height=20,
+                undo=False,
+                autoseparators=False,
+                maxundo=0
             )
             text_widget.pack(side='left', fill='both', expand=True)
             
@@ -1890,6 +2311,8 @@ class IntegratedGUI:
             
             # 插入内容
             text_widget.insert('1.0', cover_letter)
+            text_widget.edit_reset()
+            text_widget.configure(state='disabled')
             
             # 按钮框架
             button_frame = ttk.Frame(main_frame)
@@ -1899,7 +2322,8 @@ class IntegratedGUI:
             send_btn = ttk.Button(
                 button_frame,
                 text="发送邮件",
-                command=lambda: self.send_email_to_company(employee, company_name, cover_letter, subject, result_window)
+                command=lambda: self.send_email_to_company(employee, company_name, cover_letter, subject,
+                                                           result_window, hr_email=hr_email)
             )
             send_btn.pack(side='left', padx=5)
             
@@ -1915,7 +2339,8 @@ class IntegratedGUI:
             regenerate_btn = ttk.Button(
                 button_frame,
                 text="重新生成",
-                command=lambda: self.regenerate_cover_letter(employee, company_name, template_name, result_window)
+                command=lambda: self.regenerate_cover_letter(employee, company_name, result_window.template_name,
+                                                             result_window)
             )
             regenerate_btn.pack(side='left', padx=5)
             
@@ -1930,12 +2355,20 @@ class IntegratedGUI:
         except Exception as e:
             messagebox.showerror("错误", f"显示Cover Letter结果失败: {str(e)}")
     
-    def send_email_to_company(self, employee, company_name, cover_letter, subject, parent_window):
-        """发送邮件到指定公司"""
+    def _matched_hr_email(self, employee_name, company_name):
+        """从已加载的匹配结果中取公司HR邮箱，没有时返回None"""
+        for company in self._matched_cache.get(employee_name) or ():
+            if company['name'] == company_name:
+                return company.get('hr_email') or None
+        return None
+    
+    def send_email_to_company(self, employee, company_name, cover_letter, subject, parent_window, hr_email=None):
+        """发送邮件到指定公司（hr_email为空时再查询公司信息）"""
         try:
             # 获取公司HR邮箱
-            company_info = company_db.get_company_by_name(company_name)
-            hr_email = company_info.get('hr_email', '') if company_info else ''
+            if not hr_email:
+                company_info = self._get_company_info_cached(company_name)
+                hr_email = company_info.get('hr_email', '') if company_info else ''
             
             if not hr_email:
                 messagebox.showwarning("警告", f"未找到 {company_name} 的HR邮箱信息")
@@ -1963,24 +2396,25 @@ class IntegratedGUI:
                 progress_label = tk.Label(
                     progress_frame,
                     text="正在发送邮件...",
-                    font=('Arial', 12)
+                    font=self.font_large
                 )
                 progress_label.pack(pady=10)
                 
                 # 进度条
                 send_progress_bar = ttk.Progressbar(
                     progress_frame,
-                    mode='indeterminate',
+                    mode='determinate',
+                    maximum=100,
                     length=300
                 )
                 send_progress_bar.pack(pady=10)
-                send_progress_bar.start()
+                self._animate_progress_bar(send_progress_window, send_progress_bar)
                 
                 # 详细信息标签
                 detail_label = tk.Label(
                     progress_frame,
                     text="",
-                    font=('Arial', 9),
+                    font=self.font_small,
                     fg='gray'
                 )
                 detail_label.pack(pady=5)
@@ -1990,12 +2424,9 @@ class IntegratedGUI:
                     try:
                         from src.mailSender import send_single_email
                         
-                        # 定义进度回调函数
-                        def progress_callback(message, detail=""):
-                            send_progress_window.after(0, lambda: progress_label.config(text=message))
-                            if detail:
-                                send_progress_window.after(0, lambda: detail_label.config(text=detail))
-                            send_progress_window.after(0, send_progress_window.update)
+                        # 定义进度回调函数（短时间内的多次更新合并刷新）
+                        progress_callback = self._make_progress_reporter(
+                            send_progress_window, progress_label, detail_label)
                         
                         # 发送邮件
                         success = send_single_email(
@@ -2007,23 +2438,20 @@ class IntegratedGUI:
                             progress_callback=progress_callback
                         )
                         
-                        send_progress_window.after(0, send_progress_window.destroy)
+                        self._post_ui(send_progress_window.destroy)
                         
                         if success:
-                            messagebox.showinfo("发送成功", f"邮件已成功发送到 {company_name}")
-                            parent_window.destroy()
+                            self._post_ui(messagebox.showinfo, "发送成功", f"邮件已成功发送到 {company_name}")
+                            self._post_ui(parent_window.destroy)
                         else:
-                            messagebox.showerror("发送失败", f"发送邮件到 {company_name} 失败")
+                            self._post_ui(messagebox.showerror, "发送失败", f"发送邮件到 {company_name} 失败")
                             
                     except Exception as e:
-                        send_progress_window.after(0, send_progress_window.destroy)
-                        messagebox.showerror("发送错误", f"发送邮件时出现错误: {str(e)}")
+                        self._post_ui(send_progress_window.destroy)
+                        self._post_ui(messagebox.showerror, "发送错误", f"发送邮件时出现错误: {str(e)}")
                 
-                # 启动发送线程
-                import threading
-                send_thread_obj = threading.Thread(target=send_thread)
-                send_thread_obj.daemon = True
-                send_thread_obj.start()
+                # 在后台线程池中发送
+                self._task_pool.submit(send_thread)
                 
         except Exception as e:
             messagebox.showerror("错误", f"发送邮件失败: {str(e)}")
@@ -2037,14 +2465,14 @@ class IntegratedGUI:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".txt",
                 filetypes=[("文本文件", "*.txt"), ("所有文件", "*.*")],
-                initialname=f"Cover_Letter_{company_name}.txt"
+                initialfile=f"Cover_Letter_{company_name}.txt"
             )
             
             if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(f"邮件主题: {subject}\n")
-                    f.write("=" * 50 + "\n\n")
-                    f.write(cover_letter)
+                # 一次编码、一次写入
+                payload = f"邮件主题: {subject}\n{'=' * 50}\n\n{cover_letter}".encode('utf-8')
+                with open(filename, 'wb') as f:
+                    f.write(payload)
                 
                 messagebox.showinfo("保存成功", f"Cover Letter已保存到: {filename}")
                 
@@ -2054,7 +2482,18 @@ class IntegratedGUI:
     def regenerate_cover_letter(self, employee, company_name, template_name, parent_window):
         """重新生成Cover Letter"""
         parent_window.destroy()
-        self.generate_cover_letter_for_company(employee, company_name, template_name, parent_window.master)
+        self.generate_cover_letter_for_company(employee, company_name, template_name, parent_window.master,
+                                               force_regenerate=True)
+    
+    def _get_attachment_bytes(self, path):
+        """读取附件内容（文件未修改时复用上次读取的内容）"""
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._attachment_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, "rb") as f:
+                cached = (mtime, f.read())
+            self._attachment_cache[path] = cached
+        return cached[1]
     
     def send_email(self, employee):
         """发送邮件"""
@@ -2080,6 +2519,7 @@ class IntegratedGUI:
         
         # 如果从界面获取失败，则从公司信息中获取
         if not hr_email:
+            from src.coverLetterGenerator import get_company_info
             company_info = get_company_info(self.current_company)
             hr_email = company_info.get("hr_email", "")
         
@@ -2097,8 +2537,7 @@ class IntegratedGUI:
         info_frame.pack(fill='x', padx=10, pady=5)
         
         # 从.env文件获取发件人邮箱
-        # load_dotenv("input/.env")
-        sender_email = os.getenv("OUTLOOK_EMAIL", "未配置")
+        sender_email = self._smtp_creds[0] or "未配置"
         
         info_text = f"""
 发件人: {sender_email}
@@ -2107,7 +2546,7 @@ class IntegratedGUI:
 主题: {self.current_subject}
         """.strip()
         
-        ttk.Label(info_frame, text=info_text, font=('Arial', 10)).pack(anchor='w')
+        ttk.Label(info_frame, text=info_text, font=self.font_caption).pack(anchor='w')
         
         # 确认发送
         confirm_frame = ttk.LabelFrame(send_window, text="确认发送", padding=10)
@@ -2123,15 +2562,17 @@ class IntegratedGUI:
             try:
                 self.log_message(f"开始发送邮件给 {self.current_company} ({hr_email})...")
                 
-                # 从.env文件加载凭据
-                # load_dotenv("input/.env")
-                
-                sender_email = os.getenv("OUTLOOK_EMAIL")
-                password = os.getenv("OUTLOOK_PASSWORD")
+                # 使用启动时加载的凭据
+                sender_email, password = self._smtp_creds
                 
                 if not sender_email or not password:
                     raise Exception("无法从.env文件获取邮件凭据，请检查input/.env文件")
                 
+                from src.mailSender import send_message_pooled
+                from email.mime.multipart import MIMEMultipart
+                from email.mime.text import MIMEText
+                from email.mime.application import MIMEApplication
+                
                 # 创建邮件
                 msg = MIMEMultipart()
                 msg["From"] = sender_email
@@ -2144,25 +2585,15 @@ class IntegratedGUI:
                 # 添加简历附件
                 cv_path = os.path.join("CV", employee.get('简历文件', ''))
                 if os.path.exists(cv_path):
-                    with open(cv_path, "rb") as f:
-                        pdf_bytes = f.read()
+                    pdf_bytes = self._get_attachment_bytes(cv_path)
                     attach = MIMEApplication(pdf_bytes, Name=os.path.basename(cv_path))
                     attach["Content-Disposition"] = f'attachment; filename="{os.path.basename(cv_path)}"'
                     msg.attach(attach)
                 else:
                     self.log_message(f"警告：简历文件不存在: {cv_path}")
                 
-                # 连接SMTP服务器并发送
-                smtp_host = "smtp-mail.outlook.com"
-                smtp_port = 587
-                
-                smtp = smtplib.SMTP(smtp_host, smtp_port)
-                smtp.starttls()
-                smtp.login(sender_email, password)
-                
-                # 发送邮件
-                smtp.sendmail(sender_email, hr_email, msg.as_string())
-                smtp.quit()
+                # 通过mailSender复用的SMTP连接发送（Outlook SMTP，连接保持打开供后续邮件复用）
+                send_message_pooled(msg, sender_email, password, [hr_email])
                 
                 self.log_message("邮件发送成功！")
                 messagebox.showinfo("成功", f"邮件发送成功！\n收件人: {hr_email}")
@@ -2174,26 +2605,34 @@ class IntegratedGUI:
                 send_window.destroy()
     
     def refresh_template_list(self):
-        """刷新模板列表"""
+        """刷新模板列表（同时记录列表行号对应的模板ID）"""
+        self._template_order = list(self.templates)
+        items = [f"{template_id}: {self.templates[template_id]['name']}"
+                 for template_id in self._template_order]
+        # 一次调用插入所有行
         self.template_listbox.delete(0, tk.END)
-        for template_id in self.templates.keys():
-            template = self.templates[template_id]
-            self.template_listbox.insert(tk.END, f"{template_id}: {template['name']}")
+        self.template_listbox.insert(tk.END, *items)
     
     def on_template_select(self, event):
         """处理模板选择事件"""
         selection = self.template_listbox.curselection()
         if selection:
-            template_id = list(self.templates.keys())[selection[0]]
+            template_id = self._template_order[selection[0]]
             template = self.templates[template_id]
             
             self.template_name_var.set(template['name'])
             self.template_content_text.delete(1.0, tk.END)
             self.template_content_text.insert(1.0, template['content'])
     
+    def _reset_template_ids(self):
+        """新模板ID从现有最大的template_N之后开始编号"""
+        used = (int(k[len("template_"):]) for k in self.templates
+                if k.startswith("template_") and k[len("template_"):].isdigit())
+        self._next_tid = itertools.count(max(used, default=0) + 1)
+    
     def add_template(self):
         """添加模板"""
-        template_id = f"template_{len(self.templates) + 1}"
+        template_id = f"template_{next(self._next_tid)}"
         new_template = {
             "name": "新模板",
             "content": "尊敬的{company_name}招聘团队：\n\n我是{applicant_name}，非常希望能够加入贵公司的团队。\n\n{company_description}\n\n我相信我的技能和经验能够满足贵公司的要求：\n{company_requirements}\n\n期待您的回复！\n\n此致\n敬礼\n{applicant_name}"
@@ -2214,7 +2653,7 @@ class IntegratedGUI:
             messagebox.showwarning("警告", "请先选择要删除的模板！")
             return
         
-        template_id = list(self.templates.keys())[selection[0]]
+        template_id = self._template_order[selection[0]]
         template_name = self.templates[template_id]['name']
         
         result = messagebox.askyesno("确认删除", f"确定要删除模板 '{template_name}' 吗？")
@@ -2234,7 +2673,7 @@ class IntegratedGUI:
             messagebox.showwarning("警告", "请先选择要保存的模板！")
             return
         
-        template_id = list(self.templates.keys())[selection[0]]
+        template_id = self._template_order[selection[0]]
         name = self.template_name_var.get().strip()
         content = self.template_content_text.get(1.0, tk.END).strip()
         
@@ -2249,14 +2688,26 @@ class IntegratedGUI:
         
         messagebox.showinfo("成功", "模板保存成功！")
     
+    def _reload_smtp_creds(self):
+        """重新读取发件邮箱凭据（环境变量，来自.env文件）"""
+        self._smtp_creds = (os.getenv("OUTLOOK_EMAIL"), os.getenv("OUTLOOK_PASSWORD"))
+    
+    def _read_email_config(self):
+        """读取邮件配置文件（文件未修改时使用上次解析的结果），文件不存在时返回None"""
+        config_file = "input/email_config.json"
+        if not os.path.exists(config_file):
+            return None
+        key = self._file_cache_key(config_file)
+        if self._email_config is None or self._email_config[0] != key:
+            with open(config_file, 'rb') as f:
+                self._email_config = (key, json.loads(f.read()))
+        return self._email_config[1]
+    
     def load_email_config(self):
         """加载邮件配置"""
         try:
-            config_file = "input/email_config.json"
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                
+            config = self._read_email_config()
+            if config is not None:
                 # 更新界面
                 smtp_settings = config.get("smtp_settings", {})
                 self.smtp_host_var.set(smtp_settings.get("host", "smtp-mail.outlook.com"))
@@ -2299,6 +2750,8 @@ class IntegratedGUI:
             config_file = "input/email_config.json"
             with open(config_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=4, ensure_ascii=False)
+            self._email_config = None
+            self._reload_smtp_creds()
             
             messagebox.showinfo("成功", "邮件配置保存成功！")
         except Exception as e:
@@ -2321,6 +2774,7 @@ class IntegratedGUI:
                 try:
                     self.log_message("测试邮件连接...")
                     
+                    import smtplib
                     smtp = smtplib.SMTP(host, port)
                     if use_tls:
                         smtp.starttls()
@@ -2329,12 +2783,12 @@ class IntegratedGUI:
                     smtp.quit()
                     
                     self.log_message("邮件连接测试成功！")
-                    messagebox.showinfo("成功", "邮件连接测试成功！")
+                    self._post_ui(messagebox.showinfo, "成功", "邮件连接测试成功！")
                 except Exception as e:
                     self.log_message(f"邮件连接测试失败: {str(e)}")
-                    messagebox.showerror("错误", f"邮件连接测试失败: {str(e)}")
+                    self._post_ui(messagebox.showerror, "错误", f"邮件连接测试失败: {str(e)}")
             
-            threading.Thread(target=test_thread, daemon=True).start()
+            self._task_pool.submit(test_thread)
             
         except Exception as e:
             messagebox.showerror("错误", f"测试连接失败: {str(e)}")
@@ -2352,42 +2806,82 @@ class IntegratedGUI:
         log_entry = f"[{timestamp}] {message}\n"
         print(log_entry.strip())
     
-    def save_cover_letter_to_cache(self, employee_name, company_name, content, subject):
-        """保存Cover Letter到缓存文件"""
+    @staticmethod
+    def _cover_letter_cache_path(employee_name):
+        """员工Cover Letter缓存文件路径"""
+        return os.path.join("cover_letters_cache", f"{employee_name}_cover_letters.json")
+    
+    @staticmethod
+    def _read_cover_letter_file(cache_file):
+        """读取Cover Letter缓存文件，返回(修改时间, 数据)；文件不存在或损坏时数据为空字典"""
+        try:
+            mtime = os.stat(cache_file).st_mtime_ns
+        except OSError:
+            return None, {}
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return mtime, json.load(f)
+        except:
+            return mtime, {}
+    
+    def _load_cover_letter_cache(self, employee_name):
+        """获取员工的Cover Letter缓存（内存中的数据，文件被其他程序修改且没有待写入的修改时重新读取）"""
+        cache_file = self._cover_letter_cache_path(employee_name)
+        with self._cl_lock:
+            cached = self._cl_cache_mem.get(employee_name)
+            if cached is not None and employee_name in self._cl_dirty:
+                return cached[1]
+            try:
+                mtime = os.stat(cache_file).st_mtime_ns
+            except OSError:
+                mtime = None
+            if cached is None or cached[0] != mtime:
+                cached = self._read_cover_letter_file(cache_file)
+                self._cl_cache_mem[employee_name] = cached
+            return cached[1]
+    
+    @staticmethod
+    def _employee_cv_filename(employee):
+        """员工的简历文件名（CV目录下），生成Cover Letter和计算缓存键共用"""
+        return employee.get("简历文件", "")
+    
+    @classmethod
+    def _cover_letter_cache_key(cls, employee, company_name, template_name):
+        """Cover Letter缓存键：员工、公司、模板和简历文件（修改时间+大小，不读取内容）"""
+        cv_path = os.path.join("CV", cls._employee_cv_filename(employee))
+        try:
+            st = os.stat(cv_path)
+            cv_stamp = f"{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            cv_stamp = ""
+        return _cache_key(employee.get('姓名', ''), company_name, template_name, cv_stamp)
+    
+    def save_cover_letter_to_cache(self, employee_name, company_name, content, subject, cache_key=None):
+        """保存Cover Letter到缓存文件（cache_key为空时保留原记录的缓存键，手动修改后仍可复用）"""
         try:
-            import json
-            import os
             from datetime import datetime
             
-            # 创建缓存目录
-            cache_dir = "cover_letters_cache"
-            os.makedirs(cache_dir, exist_ok=True)
-            
-            # 缓存文件路径
-            cache_file = os.path.join(cache_dir, f"{employee_name}_cover_letters.json")
-            
-            # 读取现有缓存
-            cache_data = {}
-            if os.path.exists(cache_file):
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                except:
-                    cache_data = {}
+            # 读取现有缓存（内存中）
+            cache_data = self._load_cover_letter_cache(employee_name)
+            if cache_key is None:
+                cache_key = (cache_data.get(company_name) or {}).get("cache_key")
             
             # 更新缓存数据
-            cache_data[company_name] = {
+            record = {
                 "content": content,
                 "subject": subject,
                 "generated_time": datetime.now().isoformat(),
                 "mode": "professional",
                 "modified": True,
-                "modified_time": datetime.now().isoformat()
+                "modified_time": datetime.now().isoformat(),
+                "cache_key": cache_key
             }
             
-            # 保存到文件
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            # 记录修改，稍后统一写入文件（可能在后台线程中调用，定时写盘交给主线程安排）
+            with self._cl_lock:
+                self._cl_cache_mem[employee_name][1][company_name] = record
+                self._cl_dirty.setdefault(employee_name, set()).add(company_name)
+            self._post_ui(self._schedule_cl_flush)
             
             self.log_message(f"Cover Letter已保存到缓存: {company_name}")
             
@@ -2395,6 +2889,44 @@ class IntegratedGUI:
             self.log_message(f"保存Cover Letter到缓存失败: {str(e)}")
             raise e
 
+    def _schedule_cl_flush(self):
+        """在主线程中安排一次延迟写盘，已安排时不重复"""
+        with self._cl_lock:
+            if self._cl_flush_job is not None or not self._cl_dirty:
+                return
+        self._cl_flush_job = self.root.after(COVER_LETTER_FLUSH_MS, self._flush_cl_cache)
+    
+    def _flush_cl_cache(self):
+        """把内存中修改过的Cover Letter写入缓存文件（与文件中其他程序写入的记录合并）
+        
+        不调用任何Tk接口，退出时（窗口已销毁）由atexit调用也是安全的。
+        """
+        with self._cl_lock:
+            self._cl_flush_job = None
+            dirty, self._cl_dirty = self._cl_dirty, {}
+            for employee_name, companies in dirty.items():
+                cache_file = self._cover_letter_cache_path(employee_name)
+                try:
+                    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                    
+                    # 以文件中的最新内容为基础，只覆盖本程序修改过的公司
+                    memory = self._cl_cache_mem[employee_name][1]
+                    _, cache_data = self._read_cover_letter_file(cache_file)
+                    cache_data.update((company, memory[company]) for company in companies)
+                    
+                    # 先完整编码再一次写入；缓存文件只供程序读取，使用紧凑格式
+                    if orjson is not None:
+                        data = orjson.dumps(cache_data)
+                    else:
+                        data = json.dumps(cache_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                    tmp_path = cache_file + ".tmp"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_path, cache_file)
+                    self._cl_cache_mem[employee_name] = (os.stat(cache_file).st_mtime_ns, cache_data)
+                except Exception as e:
+                    print(f"❌ 写入Cover Letter缓存失败 ({employee_name}): {str(e)}")
+    
     def refresh_matched_companies(self, employee_name):
         """刷新匹配公司列表"""
         try:
@@ -2404,8 +2936,7 @@ class IntegratedGUI:
                 return
             
             # 清空现有数据
-            for item in self.companies_tree.get_children():
-                self.companies_tree.delete(item)
+            self.companies_tree.delete(*self.companies_tree.get_children())
             
             # 加载匹配的公司
             matched_companies = self.load_matched_companies(employee_name)
@@ -2416,18 +2947,19 @@ class IntegratedGUI:
                 return
             
             # 添加匹配结果
-            for idx, company in enumerate(matched_companies, 1):
-                # 截断简介
-                description = company.get('description', '')
-                if len(description) > 30:
-                    description = description[:30] + "..."
-                
-                self.companies_tree.insert("", "end", values=(
-                    idx,
-                    company['name'],
-                    company.get('hr_email', ''),
-                    description
-                ))
+            with self._batch_update(self.companies_tree):
+                for idx, company in enumerate(matched_companies, 1):
+                    # 截断简介
+                    description = company.get('description', '')
+                    if len(description) > 30:
+                        description = description[:30] + "..."
+                    
+                    self.companies_tree.insert("", "end", values=(
+                        idx,
+                        company['name'],
+                        company.get('hr_email', ''),
+                        description
+                    ))
                 
         except Exception as e:
             self.log_message(f"刷新匹配公司列表失败: {str(e)}")
@@ -2505,16 +3037,19 @@ class IntegratedGUI:
         # 打开邮件发送窗口
         self.send_email(employee)
 
+    def _get_company_dataframe(self, company_file=COMPANY_INFO_FILE):
+        """公司信息Excel的(DataFrame, 显示行)，文件未修改时所有调用方共用同一份解析结果"""
+        return _load_company_dataframe(company_file, self._file_cache_key(company_file))
+    
     def view_companies(self, employee):
         """查看公司信息"""
         try:
             # 读取公司信息文件
-            company_file = "input/companyInfo.xlsx"
-            if not os.path.exists(company_file):
+            if not os.path.exists(COMPANY_INFO_FILE):
                 messagebox.showwarning("警告", "公司信息文件不存在！")
                 return
             
-            df = pd.read_excel(company_file)
+            df, display_rows = self._get_company_dataframe()
             
             # 创建公司信息窗口
             company_window = tk.Toplevel(self.root)
@@ -2529,7 +3064,7 @@ class IntegratedGUI:
             title_label = ttk.Label(
                 main_frame, 
                 text=f"公司信息库 (共 {len(df)} 家公司)",
-                font=('Arial', 14, 'bold')
+                font=self.font_subtitle_bold
             )
             title_label.pack(pady=10)
             
@@ -2549,28 +3084,24 @@ class IntegratedGUI:
             
             # 滚动条
             scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=company_tree.yview)
-            company_tree.configure(yscrollcommand=scrollbar.set)
+            company_tree.configure(yscrollcommand=lambda first, last: self._on_lazy_tree_scroll(
+                company_tree, scrollbar, first, last))
+            
+            # 添加公司数据；在显示前插入第一批，其余滚动时追加
+            self._set_lazy_rows(company_tree, display_rows)
             
             company_tree.pack(side='left', fill='both', expand=True)
             scrollbar.pack(side='right', fill='y')
             
-            # 添加公司数据
-            for idx, row in df.iterrows():
-                company_tree.insert("", "end", values=(
-                    row.get("公司名称", ""),
-                    row.get("简介", "")[:50] + "..." if len(str(row.get("简介", ""))) > 50 else row.get("简介", ""),
-                    row.get("要求", ""),
-                    row.get("hr邮箱", "")
-                ))
-            
             # 统计信息
             stats_frame = ttk.LabelFrame(main_frame, text="统计信息", padding=10)
             stats_frame.pack(fill='x', pady=10)
             
             # 计算统计信息
             total_companies = len(df)
-            companies_with_hr = len(df[df['hr邮箱'].notna() & (df['hr邮箱'] != '')])
-            companies_with_desc = len(df[df['简介'].notna() & (df['简介'] != '')])
+            # 按列统计非空值个数，不生成筛选后的中间DataFrame
+            companies_with_hr = int(df['hr邮箱'].fillna('').ne('').sum())
+            companies_with_desc = int(df['简介'].fillna('').ne('').sum())
             
             stats_text = f"""
 总公司数: {total_companies}
@@ -2578,7 +3109,7 @@ class IntegratedGUI:
 有公司简介的公司: {companies_with_desc}
             """.strip()
             
-            stats_label = ttk.Label(stats_frame, text=stats_text, font=('Arial', 10))
+            stats_label = ttk.Label(stats_frame, text=stats_text, font=self.font_caption)
             stats_label.pack()
             
         except Exception as e:
@@ -2588,10 +3119,7 @@ class IntegratedGUI:
     def show_company_management(self):
         """公司管理界面 - 类似macOS文件夹管理"""
         # 更新按钮状态 - 使用新的颜色
-        self.employee_btn.config(bg='#6C757D')
-        self.template_btn.config(bg='#6C757D')
-        self.email_config_btn.config(bg='#6C757D')
-        self.company_btn.config(bg='#7BAFD4')
+        self._select_nav(self.company_btn)
         
         # 清空主窗口内容
         for widget in self.root.winfo_children():
@@ -2604,23 +3132,17 @@ class IntegratedGUI:
         title_label = tk.Label(
             title_frame,
             text="公司管理",
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 16, 'bold'),
+            font=self.font_title,
             bg='#7BAFD4',
             fg='#FFFFFF'
         )
         title_label.pack(side='left', padx=25, pady=20)
-        back_btn = tk.Button(
+        back_btn = self._mk_button(
             title_frame,
             text="返回主界面",
             command=self.create_main_interface,
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 10),
-            bg='#6C757D',
-            fg='#FFFFFF',
-            activebackground='#5a6268',
-            activeforeground='#FFFFFF',
-            relief='flat',
-            bd=0,
-            cursor='hand2'
+            kind='secondary',
+            font=self.font_caption
         )
         back_btn.pack(side='right', padx=25, pady=20)
         
@@ -2638,7 +3160,7 @@ class IntegratedGUI:
         self.folder_title_label = tk.Label(
             folder_title_frame, 
             text="文件夹列表", 
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold'),
+            font=self.font_large_bold,
             fg='#212529'
         )
         self.folder_title_label.pack(side='left')
@@ -2671,18 +3193,22 @@ class IntegratedGUI:
         folder_btn_frame = ttk.Frame(left_frame)
         folder_btn_frame.pack(fill='x', pady=(5, 0))
         
-        refresh_folder_btn = tk.Button(folder_btn_frame, text="刷新", 
-                                     command=self.refresh_folder_tree,
-                                     font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 10),
-                                     bg='#6C757D', fg='#FFFFFF', activebackground='#5a6268', activeforeground='#FFFFFF',
-                                     relief='flat', bd=0, cursor='hand2')
+        refresh_folder_btn = self._mk_button(
+            folder_btn_frame,
+            text="刷新",
+            command=self.refresh_folder_tree,
+            kind='secondary',
+            font=self.font_caption
+        )
         refresh_folder_btn.pack(side='left', padx=2, pady=2)
         
-        delete_folder_btn = tk.Button(folder_btn_frame, text="删除", 
-                                    command=self.delete_folder_from_tree,
-                                    font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 10),
-                                    bg='#dc3545', fg='#FFFFFF', activebackground='#c82333', activeforeground='#FFFFFF',
-                                    relief='flat', bd=0, cursor='hand2')
+        delete_folder_btn = self._mk_button(
+            folder_btn_frame,
+            text="删除",
+            command=self.delete_folder_from_tree,
+            kind='danger',
+            font=self.font_caption
+        )
         delete_folder_btn.pack(side='left', padx=2, pady=2)
         
         # 右侧：公司列表区域
@@ -2695,7 +3221,7 @@ class IntegratedGUI:
         self.company_title_label = tk.Label(
             company_title_frame, 
             text="公司列表", 
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 12, 'bold'),
+            font=self.font_large_bold,
             fg='#212529'
         )
         self.company_title_label.pack(side='left')
@@ -2704,25 +3230,30 @@ class IntegratedGUI:
         company_btn_frame = ttk.Frame(company_title_frame)
         company_btn_frame.pack(side='right')
         
-        add_company_btn = tk.Button(company_btn_frame, text="新增", 
-                                   command=self.add_company,
-                                   font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 10),
-                                   bg='#28a745', fg='#FFFFFF', activebackground='#218838', activeforeground='#FFFFFF',
-                                   relief='flat', bd=0, cursor='hand2')
+        add_company_btn = self._mk_button(
+            company_btn_frame,
+            text="新增",
+            command=self.add_company,
+            kind='success',
+            font=self.font_caption
+        )
         add_company_btn.pack(side='left', padx=2, pady=2)
         
-        edit_company_btn = tk.Button(company_btn_frame, text="编辑", 
-                                    command=self.edit_company,
-                                    font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 10),
-                                    bg='#7BAFD4', fg='#FFFFFF', activebackground='#6395C0', activeforeground='#FFFFFF',
-                                    relief='flat', bd=0, cursor='hand2')
+        edit_company_btn = self._mk_button(
+            company_btn_frame,
+            text="编辑",
+            command=self.edit_company,
+            font=self.font_caption
+        )
         edit_company_btn.pack(side='left', padx=2, pady=2)
         
-        delete_company_btn = tk.Button(company_btn_frame, text="删除", 
-                                     command=self.delete_company,
-                                     font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 10),
-                                     bg='#dc3545', fg='#FFFFFF', activebackground='#c82333', activeforeground='#FFFFFF',
-                                     relief='flat', bd=0, cursor='hand2')
+        delete_company_btn = self._mk_button(
+            company_btn_frame,
+            text="删除",
+            command=self.delete_company,
+            kind='danger',
+            font=self.font_caption
+        )
         delete_company_btn.pack(side='left', padx=2, pady=2)
         
         # 公司表格
@@ -2746,7 +3277,8 @@ class IntegratedGUI:
         
         # 添加滚动条
         company_scrollbar = ttk.Scrollbar(company_frame, orient="vertical", command=self.company_tree.yview)
-        self.company_tree.configure(yscrollcommand=company_scrollbar.set)
+        self.company_tree.configure(yscrollcommand=lambda first, last: self._on_lazy_tree_scroll(
+            self.company_tree, company_scrollbar, first, last))
         
         self.company_tree.pack(side='left', fill='both', expand=True)
         company_scrollbar.pack(side='right', fill='y')
@@ -2766,7 +3298,7 @@ class IntegratedGUI:
         drop_label = tk.Label(
             self.drop_area, 
             text="拖拽Excel文件到这里\n或点击选择文件", 
-            font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 10),
+            font=self.font_caption,
             bg='#F8F9FA',
             fg='#6C757D'
         )
@@ -2777,11 +3309,11 @@ class IntegratedGUI:
         drop_label.bind('<Button-1>', self.select_excel_file)
         
         # 文件选择按钮 - 使用新的样式
-        select_btn = tk.Button(bottom_frame, text="选择Excel文件", 
-                              command=self.select_excel_file,
-                              font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 11),
-                              bg='#7BAFD4', fg='#FFFFFF', activebackground='#6395C0', activeforeground='#FFFFFF',
-                              relief='flat', bd=0, cursor='hand2')
+        select_btn = self._mk_button(
+            bottom_frame,
+            text="选择Excel文件",
+            command=self.select_excel_file
+        )
         select_btn.pack(fill='x', pady=8)
         
         # 导入进度显示
@@ -2790,32 +3322,53 @@ class IntegratedGUI:
         
         # 导入状态标签 - 使用新的样式
         self.import_status = tk.Label(bottom_frame, text="", 
-                                    font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 9), 
+                                    font=self.font_small, 
                                     fg='#6C757D')
         self.import_status.pack()
         
         # 统计信息标签 - 使用新的样式
         self.stats_label = tk.Label(self.root, text="", 
-                                   font=('-apple-system', 'BlinkMacSystemFont', 'Segoe UI', 'Roboto', 'Helvetica Neue', 'Arial', 'sans-serif', 9), 
+                                   font=self.font_small, 
                                    fg='#6C757D')
         self.stats_label.pack(side='bottom', fill='x', padx=10, pady=5)
         
         # 初始化数据
         self.current_folder = None
         self.company_folders = {}
+        self._schedule_refresh()
+    
+    @staticmethod
+    def _folder_company_counts(companies):
+        """各文件夹下的公司数量：对全部公司按文件夹计数"""
+        return Counter(company.get("folder_name") for company in companies or ())
+    
+    def _schedule_refresh(self):
+        """在空闲时刷新文件夹树和公司列表，同一轮事件中的多次请求只刷新一次"""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.root.after_idle(self._do_refresh)
+    
+    def _do_refresh(self):
+        """读取一次全部公司，同时用于文件夹计数和公司列表"""
+        self._refresh_pending = False
         self.load_companies()
-        self.refresh_folder_tree()
-        self.refresh_company_list()
+        self.refresh_folder_tree(self.companies)
+        self.refresh_company_list(self.companies)
     
-    def refresh_folder_tree(self):
-        """刷新文件夹树形结构"""
+    def refresh_folder_tree(self, companies=None):
+        """刷新文件夹树形结构（companies为已读取的全部公司，为空时从数据库读取）"""
+        from src.company_db import company_db
         try:
             # 清空文件夹树
             for item in self.folder_tree.get_children():
                 self.folder_tree.delete(item)
             
-            # 获取所有文件夹
+            # 获取所有文件夹，各文件夹的公司数量一次统计
             folders = company_db.get_folders()
+            if companies is None:
+                companies = company_db.get_all_companies()
+            counts = self._folder_company_counts(companies)
             
             # 更新company_folders属性
             self.company_folders = {}
@@ -2826,9 +3379,7 @@ class IntegratedGUI:
             # 添加各个文件夹
             for folder in folders:
                 self.company_folders[folder] = folder
-                # 计算该文件夹下的公司数量
-                companies = company_db.get_companies_by_folder(folder)
-                count = len(companies) if companies else 0
+                count = counts.get(folder, 0)
                 self.folder_tree.insert(root_item, "end", text=f"{folder} ({count})", values=(folder,))
             
             print(f"✓ 刷新文件夹树完成，共 {len(folders)} 个文件夹")
@@ -2912,6 +3463,7 @@ class IntegratedGUI:
     
     def delete_folder_from_tree(self):
         """从树形结构中删除文件夹"""
+        from src.company_db import company_db
         selection = self.folder_tree.selection()
         if not selection:
             messagebox.showwarning("警告", "请先选择要删除的文件夹！")
@@ -2933,43 +3485,45 @@ class IntegratedGUI:
             companies = company_db.get_companies_by_folder(folder_name)
             for company in companies:
                 company_db.delete_company(company['id'])
+            self._invalidate_company_cache()
             
             # 刷新界面
-            self.refresh_folder_tree()
-            self.refresh_company_list()
+            self._schedule_refresh()
             
             messagebox.showinfo("成功", f"已删除文件夹: {folder_name}")
             
         except Exception as e:
             messagebox.showerror("错误", f"删除文件夹失败: {str(e)}")
     
-    def refresh_company_list(self):
-        """刷新公司列表"""
+    def _insert_company_rows(self, companies):
+        """把公司数据插入公司管理列表（先插入第一批，滚动到底部时再追加）"""
+        self._set_lazy_rows(self.company_tree, companies, self._company_list_values)
+    
+    @staticmethod
+    def _company_list_values(company):
+        """公司管理列表中一行的显示值"""
+        name, description, hr_email, pos_type, major, sub = (
+            company.get(k, "") for k in ("company_name", "description", "hr_email", "position_type",
+                                         "position_major_category", "position_sub_category"))
+        if len(description) > 50:
+            description = description[:50] + "..."
+        return name, description, hr_email, pos_type, major, sub
+    
+    def refresh_company_list(self, companies=None):
+        """刷新公司列表（companies为已读取的全部公司，为空时从数据库读取）"""
+        from src.company_db import company_db
         try:
             # 清空公司列表
-            for item in self.company_tree.get_children():
-                self.company_tree.delete(item)
+            self.company_tree.delete(*self.company_tree.get_children())
             
             # 获取当前文件夹下的公司
             if self.current_folder:
                 companies = company_db.get_companies_by_folder(self.current_folder)
-            else:
+            elif companies is None:
                 companies = company_db.get_all_companies()
             
             # 更新公司列表显示
-            for company in companies:
-                description = company.get("description", "")
-                if len(description) > 50:
-                    description = description[:50] + "..."
-                
-                self.company_tree.insert('', 'end', values=(
-                    company.get("company_name", ""), 
-                    description,
-                    company.get("hr_email", ""),
-                    company.get("position_type", ""),
-                    company.get("position_major_category", ""),
-                    company.get("position_sub_category", "")
-                ))
+            self._insert_company_rows(companies)
             
             # 更新统计信息
             if hasattr(self, 'stats_label') and self.stats_label:
@@ -2983,27 +3537,14 @@ class IntegratedGUI:
     
     def refresh_company_list_by_folder(self, folder_name):
         """根据文件夹刷新公司列表"""
+        from src.company_db import company_db
         try:
             # 清空公司列表
-            for item in self.company_tree.get_children():
-                self.company_tree.delete(item)
+            self.company_tree.delete(*self.company_tree.get_children())
             
             # 从数据库获取该文件夹下的公司
             companies = company_db.get_companies_by_folder(folder_name)
-            
-            for company in companies:
-                description = company.get("description", "")
-                if len(description) > 50:
-                    description = description[:50] + "..."
-                
-                self.company_tree.insert('', 'end', values=(
-                    company.get("company_name", ""), 
-                    description,
-                    company.get("hr_email", ""),
-                    company.get("position_type", ""),
-                    company.get("position_major_category", ""),
-                    company.get("position_sub_category", "")
-                ))
+            self._insert_company_rows(companies)
             
             # 更新统计信息
             total_count = len(companies)
@@ -3021,6 +3562,7 @@ class IntegratedGUI:
 
     def load_companies(self):
         """从数据库加载公司数据"""
+        from src.company_db import company_db
         try:
             self.companies = company_db.get_all_companies()
             print(f"✓ 从数据库加载了 {len(self.companies)} 家公司")
@@ -3030,6 +3572,7 @@ class IntegratedGUI:
     
     def add_company(self):
         """新增公司弹窗"""
+        from src.company_db import company_db
         win = tk.Toplevel(self.root)
         win.title("新增公司")
         win.geometry("500x450")
@@ -3109,9 +3652,9 @@ class IntegratedGUI:
             
             # 添加到数据库
             if company_db.add_company(company_data):
+                self._invalidate_company_cache()
                 messagebox.showinfo("成功", f"成功添加公司: {name}")
-                self.refresh_company_list()
-                self.refresh_folder_tree()
+                self._schedule_refresh()
                 win.destroy()
             else:
                 messagebox.showwarning("警告", f"公司 {name} 已存在！")
@@ -3121,6 +3664,7 @@ class IntegratedGUI:
     
     def edit_company(self):
         """编辑公司弹窗"""
+        from src.company_db import company_db
         selected = self.company_tree.selection()
         if not selected:
             messagebox.showwarning("警告", "请先选择要编辑的公司！")
@@ -3215,9 +3759,9 @@ class IntegratedGUI:
             
             # 更新数据库
             if company_db.update_company(company['id'], company_data):
+                self._invalidate_company_cache()
                 messagebox.showinfo("成功", f"成功更新公司: {name}")
-                self.refresh_company_list()
-                self.refresh_folder_tree()
+                self._schedule_refresh()
                 win.destroy()
             else:
                 messagebox.showerror("错误", "更新公司信息失败！")
@@ -3227,6 +3771,7 @@ class IntegratedGUI:
     
     def delete_company(self):
         """删除公司"""
+        from src.company_db import company_db
         selected = self.company_tree.selection()
         if not selected:
             messagebox.showwarning("警告", "请先选择要删除的公司！")
@@ -3240,9 +3785,9 @@ class IntegratedGUI:
         
         # 从数据库删除
         if company_db.delete_company_by_name(company_name):
+            self._invalidate_company_cache()
             messagebox.showinfo("成功", f"成功删除公司: {company_name}")
-            self.refresh_company_list()
-            self.refresh_folder_tree()
+            self._schedule_refresh()
         else:
             messagebox.showerror("错误", f"删除公司失败: {company_name}")
     
@@ -3261,7 +3806,7 @@ class IntegratedGUI:
             # 更新状态
             self.import_status.config(text="正在智能解析Excel文件...")
             self.import_progress['value'] = 10
-            self.root.update()
+            self.root.update_idletasks()
             
             # 获取Excel文件名作为文件夹名
             excel_filename = os.path.splitext(os.path.basename(file_path))[0]
@@ -3270,15 +3815,15 @@ class IntegratedGUI:
             # 导入Excel文件
             from src.smart_excel_parser import smart_excel_parser
             result = smart_excel_parser.parse_excel_to_database(file_path, excel_filename)
+            self._invalidate_company_cache()
             
             if result['success']:
                 self.import_progress['value'] = 90
                 self.import_status.config(text="正在刷新界面...")
-                self.root.update()
+                self.root.update_idletasks()
                 
                 # 刷新界面
-                self.refresh_company_list()
-                self.refresh_folder_tree()
+                self._schedule_refresh()
                 
                 self.import_progress['value'] = 100
                 self.import_status.config(text=f"成功导入 {result['total_imported']} 家公司")
@@ -3333,6 +3878,7 @@ class IntegratedGUI:
     
     def show_company_details(self, company_name):
         """显示公司详细信息"""
+        from src.company_db import company_db
         # 从数据库获取公司详细信息
         company = company_db.get_company_by_name(company_name)
         if not company:
@@ -3348,7 +3894,7 @@ class IntegratedGUI:
         text_frame = ttk.Frame(detail_window)
         text_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
-        text_widget = tk.Text(text_frame, wrap='word', font=('Arial', 10))
+        text_widget = tk.Text(text_frame, wrap='word', font=self.font_caption)
         scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=text_widget.yview)
         text_widget.configure(yscrollcommand=scrollbar.set)
         
@@ -3384,6 +3930,7 @@ HR邮箱: {company.get('hr_email', 'N/A')}
 
     def refresh_folders(self):
         """刷新文件夹列表"""
+        from src.company_db import company_db
         try:
             # 清空文件夹树
             for item in self.folder_tree.get_children():
@@ -3391,12 +3938,8 @@ HR邮箱: {company.get('hr_email', 'N/A')}
             
             # 获取所有文件夹
             folders = company_db.get_folders()
-            self.company_folders = {folder: [] for folder in folders}
-            
-            # 为每个文件夹获取公司列表
-            for folder in folders:
-                companies = company_db.get_companies_by_folder(folder)
-                self.company_folders[folder] = companies
+            counts = self._folder_company_counts(company_db.get_all_companies())
+            self.company_folders = {}
             
             # 添加根节点
             root_item = self.folder_tree.insert("", "end", text="所有文件夹", values=("root",), open=True)
@@ -3404,9 +3947,7 @@ HR邮箱: {company.get('hr_email', 'N/A')}
             # 添加各个文件夹
             for folder in folders:
                 self.company_folders[folder] = folder
-                # 计算该文件夹下的公司数量
-                companies = company_db.get_companies_by_folder(folder)
-                count = len(companies) if companies else 0
+                count = counts.get(folder, 0)
                 self.folder_tree.insert(root_item, "end", text=f"{folder} ({count})", values=(folder,))
             
             print(f"✓ 刷新文件夹列表完成，共 {len(folders)} 个文件夹")
@@ -3487,6 +4028,7 @@ HR邮箱: {company.get('hr_email', 'N/A')}
     
     def refresh_positions_by_category(self, employee_name):
         """根据岗位大类刷新岗位列表"""
+        from src.company_db import company_db
         try:
             selected_category = self.category_var.get()
             if not selected_category:
@@ -3504,19 +4046,14 @@ HR邮箱: {company.get('hr_email', 'N/A')}
                 # 即使没有公司，也显示空的列表，不返回
             
             # 获取员工信息用于匹配
-            employee = None
-            for emp in self.employees:
-                if emp['姓名'] == employee_name:
-                    employee = emp
-                    break
+            employee = self._employees_by_name.get(employee_name)
             
             # 如果找到员工，运行匹配算法获取推荐公司
             recommended_companies = []
             if employee:
                 try:
                     # 运行匹配算法获取推荐公司（5-15个）
-                    from src.companyMatch import run_company_match
-                    matched_companies = run_company_match(employee['姓名'], 'flexible')
+                    matched_companies = self._run_company_match(employee['姓名'], 'flexible')
                     if matched_companies:
                         # 提取推荐的公司名称
                         recommended_companies = [company.get('公司名称', '') for company in matched_companies]
@@ -3617,18 +4154,10 @@ HR邮箱: {company.get('hr_email', 'N/A')}
             if column != "#1":
                 return
             
-            # 获取当前值
-            current_values = tree.item(item, 'values')
-            if not current_values:
-                return
-            
-            # 切换选择状态
-            is_selected = current_values[0] == "☑️"
-            new_selection = "☑️" if not is_selected else "☐"
-            
-            # 更新显示
-            new_values = (new_selection,) + current_values[1:]
-            tree.item(item, values=new_values)
+            # 记录点击，连续点击在同一次回调中统一处理
+            self._pending_toggles.append((tree, item))
+            if self._toggle_job is None:
+                self._toggle_job = self.root.after(CLICK_COALESCE_MS, self._apply_pending_toggles)
             
         except IndexError:
             # 如果没有选中项目，忽略
@@ -3636,6 +4165,38 @@ HR邮箱: {company.get('hr_email', 'N/A')}
         except Exception as e:
             print(f"切换公司选择状态时出错: {e}")
     
+    def _apply_pending_toggles(self):
+        """依次应用记录的勾选切换，只更新选择列"""
+        self._toggle_job = None
+        pending, self._pending_toggles = self._pending_toggles, []
+        for tree, item in pending:
+            try:
+                if not tree.winfo_exists():
+                    continue
+                # 行iid即公司在该列表中的下标，直接取公司名称
+                panel = tree._panel
+                company_name = panel._companies[int(item)].get('company_name', '')
+                
+                # 切换选择状态
+                if company_name in panel._checked:
+                    panel._checked.discard(company_name)
+                    tree.set(item, "选择", "☐")
+                else:
+                    panel._checked.add(company_name)
+                    tree.set(item, "选择", "☑️")
+            except Exception as e:
+                print(f"切换公司选择状态时出错: {e}")
+    
+    @staticmethod
+    def _add_company_tree_bindtag(tree):
+        """给树形视图加上公司勾选列表的绑定标签（放在控件自身标签之后，与tree.bind顺序一致）"""
+        tags = tree.bindtags()
+        tree.bindtags(tags[:1] + (COMPANY_TREE_BINDTAG,) + tags[1:])
+    
+    def _on_company_tree_click(self, event):
+        """公司勾选列表的点击事件"""
+        self.toggle_company_selection_in_tree_column(event, event.widget)
+    
     def toggle_company_selection_in_tree(self, event, tree):
         """切换树形视图中的公司选择状态（兼容旧版本）"""
         self.toggle_company_selection_in_tree_column(event, tree)
@@ -3646,70 +4207,31 @@ HR邮箱: {company.get('hr_email', 'N/A')}
             # 获取推荐的公司列表
             recommended_companies = []
             try:
-                from src.companyMatch import run_company_match
                 # 这里需要获取当前员工名称，暂时使用默认员工
-                recommended_companies = run_company_match("LIU Siyuan", 'flexible')
+                recommended_companies = self._run_company_match("LIU Siyuan", 'flexible')
                 recommended_names = [company.get('公司名称', company.get('company_name', '')) for company in recommended_companies]
             except:
                 # 如果获取推荐公司失败，则全选
                 recommended_names = []
             
-            # 遍历所有页面
-            for tab_id in notebook.tabs():
-                page = notebook.nametowidget(tab_id)
-                # 找到页面中的树形视图
-                for widget in page.winfo_children():
-                    if isinstance(widget, ttk.Treeview):
-                        tree = widget
-                        for item in tree.get_children():
-                            current_values = tree.item(item, 'values')
-                            if current_values:
-                                company_name = current_values[1]
-                                # 只选中推荐的公司
-                                is_recommended = company_name in recommended_names
-                                new_selection = "☑️" if is_recommended else "☐"
-                                new_values = (new_selection,) + current_values[1:]
-                                tree.item(item, values=new_values)
-                        break
+            # 只选中推荐的公司，再刷新各页面已插入的行
+            self._set_checked_companies([notebook], recommended_names)
         except Exception as e:
             print(f"全选推荐公司时出错: {e}")
     
     def deselect_all_companies_in_tree(self, notebook):
         """取消全选所有公司"""
         try:
-            # 遍历所有页面
-            for tab_id in notebook.tabs():
-                page = notebook.nametowidget(tab_id)
-                # 找到页面中的树形视图
-                for widget in page.winfo_children():
-                    if isinstance(widget, ttk.Treeview):
-                        tree = widget
-                        for item in tree.get_children():
-                            current_values = tree.item(item, 'values')
-                            if current_values:
-                                new_values = ("☐",) + current_values[1:]
-                                tree.item(item, values=new_values)
-                        break
+            self._set_checked_companies([notebook], ())
         except Exception as e:
             print(f"取消全选公司时出错: {e}")
     
     def generate_for_selected_companies_in_tree(self, employee, notebook):
         """为树形视图中选中的公司生成Cover Letter"""
         try:
-            selected_companies = []
-            
-            # 遍历所有页面，获取选中的公司
-            for tab_id in notebook.tabs():
-                page = notebook.nametowidget(tab_id)
-                for widget in page.winfo_children():
-                    if isinstance(widget, ttk.Treeview):
-                        tree = widget
-                        for item in tree.get_children():
-                            values = tree.item(item, 'values')
-                            if values and values[0] == "☑️":  # 已选中
-                                company_name = values[1]
-                                selected_companies.append(company_name)
-                        break
+            # 遍历所有页面，获取选中的公司（包括尚未插入树形视图的行）
+            selected_companies = [company.get('company_name', '')
+                                  for company in self._get_checked_companies_in_notebook(notebook)]
             
             if not selected_companies:
                 messagebox.showwarning("警告", "请先选择要生成Cover Letter的公司！")
@@ -3726,21 +4248,9 @@ HR邮箱: {company.get('hr_email', 'N/A')}
     def send_to_selected_companies_in_tree(self, employee, notebook):
         """为树形视图中选中的公司发送邮件"""
         try:
-            selected_companies = []
-            
-            # 遍历所有页面，获取选中的公司
-            for tab_id in notebook.tabs():
-                page = notebook.nametowidget(tab_id)
-                for widget in page.winfo_children():
-                    if isinstance(widget, ttk.Treeview):
-                        tree = widget
-                        for item in tree.get_children():
-                            values = tree.item(item, 'values')
-                            if values and values[0] == "☑️":  # 已选中
-                                company_name = values[1]
-                                hr_email = values[4]  # HR邮箱在第5列
-                                selected_companies.append((company_name, hr_email))
-                        break
+            # 遍历所有页面，获取选中的公司（包括尚未插入树形视图的行）
+            selected_companies = [(company.get('company_name', ''), company.get('hr_email', ''))
+                                  for company in self._get_checked_companies_in_notebook(notebook)]
             
             if not selected_companies:
                 messagebox.showwarning("警告", "请先选择要发送邮件的公司！")
@@ -3755,62 +4265,35 @@ HR邮箱: {company.get('hr_email', 'N/A')}
             print(f"为选中公司发送邮件时出错: {e}")
             messagebox.showerror("错误", f"发送邮件失败: {str(e)}")
     
-    def select_all_companies_in_notebook(self, notebook):
-        """全选notebook中的所有公司"""
+    def select_all_companies_in_notebook(self, panel):
+        """全选公司列表中所有分类的公司"""
         try:
-            # 遍历所有页面
-            for tab_id in notebook.tabs():
-                page = notebook.nametowidget(tab_id)
-                # 找到页面中的树形视图
-                for widget in page.winfo_children():
-                    if isinstance(widget, ttk.Treeview):
-                        tree = widget
-                        for item in tree.get_children():
-                            current_values = tree.item(item, 'values')
-                            if current_values:
-                                new_values = ("☑️",) + current_values[1:]
-                                tree.item(item, values=new_values)
-                        break
+            all_names = {c.get('company_name', '')
+                         for companies in panel._companies_by_category.values()
+                         for c in companies}
+            self._set_checked_companies([panel], all_names)
         except Exception as e:
             print(f"全选公司时出错: {e}")
     
-    def deselect_all_companies_in_notebook(self, notebook):
-        """取消全选notebook中的所有公司"""
+    def deselect_all_companies_in_notebook(self, panel):
+        """取消全选公司列表中的所有公司"""
         try:
-            # 遍历所有页面
-            for tab_id in notebook.tabs():
-                page = notebook.nametowidget(tab_id)
-                # 找到页面中的树形视图
-                for widget in page.winfo_children():
-                    if isinstance(widget, ttk.Treeview):
-                        tree = widget
-                        for item in tree.get_children():
-                            current_values = tree.item(item, 'values')
-                            if current_values:
-                                new_values = ("☐",) + current_values[1:]
-                                tree.item(item, values=new_values)
-                        break
+            self._set_checked_companies([panel], ())
         except Exception as e:
             print(f"取消全选公司时出错: {e}")
     
-    def generate_for_selected_companies_in_notebook(self, employee, notebook):
-        """为选中的公司生成Cover Letter（从notebook）"""
+    def _get_checked_companies_in_notebook(self, panel):
+        """按分类顺序获取已勾选的公司（包括未显示的分类和尚未插入的行）"""
+        return [company
+                for companies in panel._companies_by_category.values()
+                for company in companies
+                if company.get('company_name', '') in panel._checked]
+    
+    def generate_for_selected_companies_in_notebook(self, employee, panel):
+        """为选中的公司生成Cover Letter（从公司列表面板）"""
         try:
-            selected_companies = []
-            
-            # 遍历所有页面
-            for tab_id in notebook.tabs():
-                page = notebook.nametowidget(tab_id)
-                # 找到页面中的树形视图
-                for widget in page.winfo_children():
-                    if isinstance(widget, ttk.Treeview):
-                        tree = widget
-                        for item in tree.get_children():
-                            current_values = tree.item(item, 'values')
-                            if current_values and current_values[0] == "☑️":  # 已选中
-                                company_name = current_values[1]
-                                selected_companies.append(company_name)
-                        break
+            selected_companies = [company.get('company_name', '')
+                                  for company in self._get_checked_companies_in_notebook(panel)]
             
             if not selected_companies:
                 messagebox.showwarning("警告", "请先选择要生成Cover Letter的公司！")
@@ -3824,25 +4307,11 @@ HR邮箱: {company.get('hr_email', 'N/A')}
             print(f"为选中公司生成Cover Letter时出错: {e}")
             messagebox.showerror("错误", f"生成Cover Letter失败: {str(e)}")
     
-    def send_to_selected_companies_in_notebook(self, employee, notebook):
-        """为选中的公司发送邮件（从notebook）"""
+    def send_to_selected_companies_in_notebook(self, employee, panel):
+        """为选中的公司发送邮件（从公司列表面板）"""
         try:
-            selected_companies = []
-            
-            # 遍历所有页面
-            for tab_id in notebook.tabs():
-                page = notebook.nametowidget(tab_id)
-                # 找到页面中的树形视图
-                for widget in page.winfo_children():
-                    if isinstance(widget, ttk.Treeview):
-                        tree = widget
-                        for item in tree.get_children():
-                            current_values = tree.item(item, 'values')
-                            if current_values and current_values[0] == "☑️":  # 已选中
-                                company_name = current_values[1]
-                                hr_email = current_values[4]  # HR邮箱在第5列
-                                selected_companies.append((company_name, hr_email))
-                        break
+            selected_companies = [(company.get('company_name', ''), company.get('hr_email', ''))
+                                  for company in self._get_checked_companies_in_notebook(panel)]
             
             if not selected_companies:
                 messagebox.showwarning("警告", "请先选择要发送邮件的公司！")
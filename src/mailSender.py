@@ -11,13 +11,13 @@ Supports caching and HR email from Excel file.
 -------------------------------------------------------------
 """
 
-import os, smtplib, pandas as pd, glob
+import os, smtplib, pandas as pd, glob, threading, atexit
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 from getpass import getpass
 # from dotenv import load_dotenv
-from .coverLetterGenerator import generate_cover_letter_and_subject, get_company_info
+# coverLetterGenerator依赖torch/transformers，只在批量发送需要生成时再导入，GUI发信不必加载
 
 # ---------- Paths & SMTP ----------
 PDF_PATH   = r"CV/CV_LIU Siyuan_25_1.pdf"
@@ -31,6 +31,11 @@ CV_FILENAME = "CV_LIU Siyuan_25_1.pdf"
 COVER_LETTER_MODE = "professional"  # professional or enthusiastic
 FORCE_REGENERATE = False  # 是否强制重新生成cover letter
 
+# 复用的SMTP连接（同一账号连续发送时不重复握手和登录）
+_SMTP_CONN = None
+_SMTP_USER = None
+_SMTP_LOCK = threading.Lock()
+
 # Load .env from input directory
     # load_dotenv("input/.env")
 
@@ -52,6 +57,60 @@ def find_matched_companies_file():
     # 如果没有找到特定文件，返回第一个
     return csv_files[0]
 
+def _get_smtp(sender, password):
+    """获取复用的SMTP连接，连接失效或账号变化时重新连接（调用方需持有_SMTP_LOCK）"""
+    global _SMTP_CONN, _SMTP_USER
+    if _SMTP_CONN is not None:
+        if _SMTP_USER == sender:
+            try:
+                if _SMTP_CONN.noop()[0] == 250:
+                    return _SMTP_CONN
+            except (smtplib.SMTPException, OSError):
+                pass
+        close_smtp()
+    
+    smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+    try:
+        smtp.starttls()
+        smtp.login(sender, password)
+    except Exception:
+        # TLS或登录失败时关闭新建的连接，避免泄漏套接字
+        smtp.close()
+        raise
+    _SMTP_CONN, _SMTP_USER = smtp, sender
+    return smtp
+
+def close_smtp():
+    """关闭复用的SMTP连接"""
+    global _SMTP_CONN, _SMTP_USER
+    if _SMTP_CONN is None:
+        return
+    try:
+        _SMTP_CONN.quit()
+    except Exception:
+        pass
+    _SMTP_CONN = _SMTP_USER = None
+
+atexit.register(close_smtp)
+
+def send_message_pooled(msg, sender, password, recipients):
+    """通过复用的SMTP连接发送邮件（GUI和send_single_email共用）
+    
+    只有建立连接失败时重试一次；邮件交给服务器后断开不重发，避免HR收到重复邮件。
+    send_message直接按字节序列化邮件，不再额外生成一份完整的字符串。
+    """
+    with _SMTP_LOCK:
+        try:
+            smtp = _get_smtp(sender, password)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError):
+            close_smtp()
+            smtp = _get_smtp(sender, password)
+        try:
+            smtp.send_message(msg, sender, recipients)
+        except smtplib.SMTPServerDisconnected:
+            close_smtp()
+            raise
+
 def send_single_email(to_email, company_name, cover_letter, subject, employee_name, progress_callback=None):
     """发送单封邮件
     
@@ -77,11 +136,6 @@ def send_single_email(to_email, company_name, cover_letter, subject, employee_na
         if progress_callback:
             progress_callback("正在连接邮件服务器...", "连接到Outlook SMTP服务器")
         
-        # 连接SMTP
-        smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
-        smtp.starttls()
-        smtp.login(sender, password)
-        
         if progress_callback:
             progress_callback("正在准备邮件内容...", "创建邮件和附件")
         
@@ -106,9 +160,8 @@ def send_single_email(to_email, company_name, cover_letter, subject, employee_na
         if progress_callback:
             progress_callback("正在发送邮件...", f"发送到 {company_name}")
         
-        # 发送邮件
-        smtp.sendmail(sender, to_email, msg.as_string())
-        smtp.quit()
+        # 发送邮件（连接保持打开供后续邮件复用）
+        send_message_pooled(msg, sender, password, [to_email])
         
         if progress_callback:
             progress_callback("邮件发送完成", f"成功发送到 {company_name}")
@@ -122,6 +175,8 @@ def send_single_email(to_email, company_name, cover_letter, subject, employee_na
 
 def send_emails_to_matched_companies():
     """发送邮件给匹配的公司"""
+    from .coverLetterGenerator import generate_cover_letter_and_subject, get_company_info
+    
     # ---------- 1. Load matched companies ----------
     csv_file = find_matched_companies_file()
     if not csv_file: